@@ -16,8 +16,8 @@ from update_profiles import update_profiles_from_data
 from generate_index import generate_index
 from webhook_helpers import send_pilot_stats, send_flight_summary
 from validation import (
-    validate_file_upload, validate_xml_content, validate_discord_data,
-    validate_callsigns_list, sanitize_string
+    validate_file_upload, validate_discord_data,
+    validate_callsigns_list, sanitize_string, get_upload_size
 )
 from error_handling import (
     APIError, ErrorCodes, create_error_response, handle_api_error,
@@ -102,11 +102,7 @@ def validate_request_size():
 def validate_file_size(file):
     """Validate file size for uploads"""
     if file:
-        file.seek(0, 2)  # Seek to end
-        file_size = file.tell()
-        file.seek(0)  # Reset to beginning
-        
-        if file_size > MAX_CONTENT_LENGTH:
+        if get_upload_size(file) > MAX_CONTENT_LENGTH:
             raise APIError(
                 error_code=ErrorCodes.FILE_TOO_LARGE,
                 message=f"File too large. Maximum size is {MAX_CONTENT_LENGTH // (1024*1024)}MB",
@@ -171,25 +167,18 @@ def upload_xml():
         logger.info(f"Saving uploaded file: {filename}")
         file.save(filepath)
 
-        # Validate XML content structure
-        is_valid, error_msg = validate_xml_content(filepath)
-        if not is_valid:
-            # Clean up the uploaded file on validation error
+        # Validate the XML structure and process it in a single pass
+        logger.info(f"Processing XML file: {filepath}")
+        try:
+            parse_result = parse_xml(filepath, validate=True)
+        except APIError:
+            # Clean up the uploaded file on validation or parse error
             try:
                 safe_file_delete(filepath)
                 logger.debug(f"Cleaned up temporary file after validation error: {filepath}")
             except Exception as cleanup_error:
                 logger.warning(f"Failed to clean up temporary file {filepath}: {cleanup_error}")
-            
-            raise APIError(
-                error_code=ErrorCodes.XML_INVALID_STRUCTURE,
-                message=error_msg,
-                status_code=400
-            )
-
-        # Process the XML
-        logger.info(f"Processing XML file: {filepath}")
-        parse_result = parse_xml(filepath)
+            raise
         
         if parse_result.get('success', True):
             pilots_count = parse_result.get('pilots_count', 'unknown')
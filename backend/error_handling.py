@@ -2,12 +2,25 @@ import os
 import json
 import logging
 import time
+import tempfile
 import functools
 from typing import Dict, Any, Optional, Callable, Union
 from werkzeug.exceptions import HTTPException
 from flask import jsonify, request
 import traceback
 
+# orjson when available; _dumps matches json.dumps(indent=2) and returns bytes.
+# Shared with profile_manager, update_profile and xml_parser
+try:
+    import orjson
+    _loads = orjson.loads
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _loads = json.loads
+    def _dumps(obj):
+        return json.dumps(obj, indent=2).encode('utf-8')
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -263,6 +276,36 @@ def safe_file_save(file_path: str, content: Union[str, bytes], mode: str = 'w')
     with open(file_path, mode) as f:
         f.write(content)
 
+@retry_operation(max_attempts=3, delay=0.5)
+def safe_file_replace(file_path: Union[str, os.PathLike], content: bytes) -> None:
+    """
+    Atomically replace a file with retry mechanism
+    
+    The content goes to a uniquely named temp file in the same directory, which
+    is then swapped in, so concurrent writers never share a temp file and readers
+    never see a partial one. The temp file is removed if the write fails.
+    
+    Args:
+        file_path: Path of the file to replace
+        content: Bytes to write
+    """
+    directory = os.path.dirname(file_path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        # mkstemp creates the file 0600; keep the usual mode for the target
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
 @retry_operation(max_attempts=3, delay=0.5)
 def safe_file_read(file_path: str, mode: str = 'r') -> str:
     """
@@ -298,7 +341,7 @@ def safe_json_save(file_path: str, data: Dict[str, Any]) -> None:
         file_path: Path to save the JSON file
         data: Data to save
     """
-    safe_file_save(file_path, json.dumps(data, indent=2))
+    safe_file_replace(file_path, _dumps(data))
 
 @retry_operation(max_attempts=3, delay=0.5)
 def safe_json_read(file_path: str) -> Dict[str, Any]:
@@ -311,8 +354,8 @@ def safe_json_read(file_path: str) -> Dict[str, Any]:
     Returns:
         Parsed JSON data
     """
-    content = safe_file_read(file_path)
-    return json.loads(content)
+    content = safe_file_read(file_path, 'rb')
+    return _loads(content)
 
 def handle_api_error(error: Exception) -> tuple:
     """
@@ -1,3 +1,4 @@
+import functools
 import re
 import json
 from pathlib import Path
@@ -19,15 +20,43 @@ def load_nickname_fragments():
             return json.load(f)
     return DEFAULT_FRAGMENTS
 
+# Fragments from the last read of nicknames.json and the mtime they were read at
+_FRAGMENTS = None
+_FRAGMENTS_MTIME = None
+
+def get_nickname_fragments():
+    """Cached nickname fragments, re-read only when nicknames.json changes"""
+    global _FRAGMENTS, _FRAGMENTS_MTIME
+    try:
+        mtime = NICKNAME_JSON.stat().st_mtime_ns
+    except OSError:
+        mtime = None
+    if _FRAGMENTS is None or mtime != _FRAGMENTS_MTIME:
+        _FRAGMENTS = load_nickname_fragments()
+        _FRAGMENTS_MTIME = mtime
+        _resolve_default_nickname.cache_clear()
+    return _FRAGMENTS
+
+NON_WORD_CHARS = re.compile(r"[^\w]")
+
 def normalize_name(name):
-    return re.sub(r"[^\w]", "", name).lower()
+    return NON_WORD_CHARS.sub("", name).lower()
 
 def resolve_fuzzy_nickname(raw_name, nickname_fragments=None):
     if nickname_fragments is None:
-        nickname_fragments = load_nickname_fragments()
+        # Refreshes the fragments (and the memoized results) if nicknames.json changed
+        get_nickname_fragments()
+        return _resolve_default_nickname(raw_name)
+    return match_nickname(raw_name, nickname_fragments)
+
+@functools.lru_cache(maxsize=2048)
+def _resolve_default_nickname(raw_name):
+    """match_nickname against the cached nicknames.json fragments, memoized per name"""
+    return match_nickname(raw_name, _FRAGMENTS)
 
+def match_nickname(raw_name, nickname_fragments):
     norm = normalize_name(raw_name)
     for nickname, fragments in nickname_fragments.items():
         if all(fragment in norm for fragment in fragments):
             return nickname
-    return normalize_name(raw_name)
+    return norm
@@ -1,46 +1,71 @@
-import json
 from pathlib import Path
 
-def load_profile(nickname, profile_dir):
-    path = Path(profile_dir) / f"{nickname}.json"
-    if not path.exists():
-        return {
-            "callsign": nickname,
-            "nicknames": [nickname],
-            "profile_image": "",
-            "platform_hours": {"DCS": 0, "BMS": 0, "IL2": 0, "Total": 0},
-            "aircraft_hours": {},
-            "mission_summary": {
-                "logs_flown": 0, "aa_kills": 0, "aa_avg": 0.0, "ag_kills": 0, "ag_avg": 0.0,
-                "frat_kills": 0, "frat_avg": 0.0, "rtb": 0, "rtb_avg": 0.0,
-                "ejections": 0, "ejections_avg": 0.0, "res": 0, "res_avg": 0.0,
-                "mia": 0, "mia_avg": 0.0, "kia": 0, "kia_avg": 0.0, 
-                "ctd": 0, "ctd_avg": 0.0
-            },
-            "missions": [],
-            "notes": ""
-        }
-    with open(path, 'r') as f:
-        return json.load(f)
+from error_handling import _loads, _dumps, safe_file_replace
 
-def save_profile(nickname, data, profile_dir):
-    path = Path(profile_dir) / f"{nickname}.json"
-    with open(path, 'w') as f:
-        json.dump(data, f, indent=2)
+# (profile_dir, nickname) -> profile path, so repeat lookups skip building a new Path
+_path_cache = {}
+
+def profile_path(nickname, profile_dir):
+    key = (profile_dir, nickname)
+    path = _path_cache.get(key)
+    if path is None:
+        path = _path_cache[key] = Path(profile_dir) / f"{nickname}.json"
+    return path
+
+def load_profile(nickname, profile_dir, path=None, exists=None):
+    # Callers that already listed profile_dir can pass exists=False to skip the open;
+    # otherwise just try the read rather than stat-ing first
+    if path is None:
+        path = profile_path(nickname, profile_dir)
+    if exists is not False:
+        try:
+            return _loads(path.read_bytes())
+        except FileNotFoundError:
+            pass
+    return {
+        "callsign": nickname,
+        "nicknames": [nickname],
+        "profile_image": "",
+        "platform_hours": {"DCS": 0, "BMS": 0, "IL2": 0, "Total": 0},
+        "aircraft_hours": {},
+        "mission_summary": {
+            "logs_flown": 0, "aa_kills": 0, "aa_avg": 0.0, "ag_kills": 0, "ag_avg": 0.0,
+            "frat_kills": 0, "frat_avg": 0.0, "rtb": 0, "rtb_avg": 0.0,
+            "ejections": 0, "ejections_avg": 0.0, "res": 0, "res_avg": 0.0,
+            "mia": 0, "mia_avg": 0.0, "kia": 0, "kia_avg": 0.0, 
+            "ctd": 0, "ctd_avg": 0.0
+        },
+        "missions": [],
+        "notes": ""
+    }
+
+def save_profile(nickname, data, profile_dir, path=None):
+    if path is None:
+        path = profile_path(nickname, profile_dir)
+    # Swapped in from a unique temp file, so concurrent uploads for one pilot never collide
+    safe_file_replace(path, _dumps(data))
 
 def add_minutes(time_str, minutes):
     hours, mins = map(int, time_str.split(":"))
     total = hours * 60 + mins + minutes
     return f"{total // 60}:{str(total % 60).zfill(2)}"
 
+# Mission summary counters and the per-log average kept for each
+MISSION_COUNTERS = tuple(
+    (key, f"{key.split('_')[0]}_avg")
+    for key in ("aa_kills", "ag_kills", "frat_kills", "rtb", "ejections", "res", "mia", "kia", "ctd")
+)
+
 def update_profile(profile, mission_data, flight_minutes, aircraft):
     ms = profile["mission_summary"]
     ms["logs_flown"] += 1
+    logs_flown = ms["logs_flown"]
     
     # Update all mission statistics
-    for key in ["aa_kills", "ag_kills", "frat_kills", "rtb", "ejections", "res", "mia", "kia", "ctd"]:
-        ms[key] += mission_data.get(key, 0)
-        ms[f"{key.split('_')[0]}_avg"] = round(ms[key] / ms["logs_flown"], 2)
+    for key, avg_key in MISSION_COUNTERS:
+        total = ms[key] + mission_data.get(key, 0)
+        ms[key] = total
+        ms[avg_key] = round(total / logs_flown, 2)
 
     # Update platform hours based on detected platform (in minutes)
     platform = mission_data.get("platform", "DCS")
@@ -5,56 +5,77 @@ Setup script for DCS Pilot Logbook Backend
 
 import os
 import sys
+import hashlib
 import subprocess
 from pathlib import Path
 from generate_index import generate_index
 
+REQUIREMENTS_FILE = Path("requirements.txt")
+# Same location generate_index() writes to
+PROFILE_DIR = Path(__file__).parent / "pilot_profiles"
+# Records the requirements.txt hash last installed into the active environment
+REQUIREMENTS_MARKER = Path(sys.prefix) / ".loggers-req-hash"
+
+# Default contents for a freshly created .env file
+ENV_TEMPLATE = """# Flask Configuration
+FLASK_HOST=0.0.0.0
+FLASK_PORT=5000
+FLASK_DEBUG=False
+
+# Discord Webhook (optional)
+DISCORD_WEBHOOK_URL=your_discord_webhook_url_here
+
+# File Upload Configuration
+MAX_CONTENT_LENGTH=16777216  # 16MB in bytes
+"""
+
 def check_python_version():
     """Check if Python version is compatible"""
-    if sys.version_info < (3, 8):
+    if sys.hexversion < 0x03080000:
         print("❌ Python 3.8 or higher is required")
         sys.exit(1)
     print(f"✅ Python {sys.version_info.major}.{sys.version_info.minor} detected")
 
 def install_dependencies():
-    """Install Python dependencies"""
+    """Install Python dependencies unless requirements.txt is unchanged"""
+    requirements_hash = hashlib.sha256(REQUIREMENTS_FILE.read_bytes()).hexdigest()
+    if REQUIREMENTS_MARKER.exists() and REQUIREMENTS_MARKER.read_text().strip() == requirements_hash:
+        print("✅ Dependencies already installed")
+        return
+    
     print("📦 Installing Python dependencies...")
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+        pip_args = [
+            sys.executable, "-m", "pip", "install",
+            "--disable-pip-version-check", "--prefer-binary", "--no-input",
+            "-r", str(REQUIREMENTS_FILE)
+        ]
+        if not sys.stdout.isatty():
+            pip_args.append("--quiet")
+        subprocess.check_call(pip_args, env={**os.environ, "PIP_NO_PYTHON_VERSION_WARNING": "1"})
         print("✅ Dependencies installed successfully")
     except subprocess.CalledProcessError as e:
         print(f"❌ Failed to install dependencies: {e}")
         sys.exit(1)
+    
+    try:
+        REQUIREMENTS_MARKER.write_text(requirements_hash)
+    except OSError as e:
+        print(f"⚠️  Warning: Could not record installed requirements: {e}")
 
 def create_directories():
     """Create necessary directories"""
     print("📁 Creating directories...")
-    directories = [
-        "pilot_profiles",
-        "uploads",
-        "__pycache__"
-    ]
-    
-    for directory in directories:
-        Path(directory).mkdir(exist_ok=True)
-        print(f"✅ Created directory: {directory}")
+    for directory in (PROFILE_DIR, "uploads"):
+        os.makedirs(directory, exist_ok=True)
+        print(f"✅ Directory ready: {directory}")
 
 def create_env_file():
     """Create .env file if it doesn't exist"""
     env_file = Path(".env")
     if not env_file.exists():
         print("🔧 Creating .env file...")
-        with open(env_file, "w") as f:
-            f.write("# Flask Configuration\n")
-            f.write("FLASK_HOST=0.0.0.0\n")
-            f.write("FLASK_PORT=5000\n")
-            f.write("FLASK_DEBUG=False\n")
-            f.write("\n")
-            f.write("# Discord Webhook (optional)\n")
-            f.write("DISCORD_WEBHOOK_URL=your_discord_webhook_url_here\n")
-            f.write("\n")
-            f.write("# File Upload Configuration\n")
-            f.write("MAX_CONTENT_LENGTH=16777216  # 16MB in bytes\n")
+        env_file.write_text(ENV_TEMPLATE)
         print("✅ Created .env file")
     else:
         print("✅ .env file already exists")
@@ -62,6 +83,16 @@ def create_env_file():
 def initialize_pilot_index():
     """Initialize the pilot index"""
     print("👥 Initializing pilot index...")
+    
+    # Skip regeneration when no profile was added, removed or modified since the last index write
+    index_file = PROFILE_DIR / "index.json"
+    if index_file.exists():
+        source_mtimes = [PROFILE_DIR.stat().st_mtime]
+        source_mtimes.extend(p.stat().st_mtime for p in PROFILE_DIR.glob("*.json") if p != index_file)
+        if index_file.stat().st_mtime >= max(source_mtimes):
+            print("✅ Pilot index up to date")
+            return
+    
     try:
         generate_index()
         print("✅ Pilot index initialized")
@@ -7,128 +7,152 @@ with sample data that mimics what DCSServerBot would send.
 """
 
 import json
-import requests
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
+# Prefer orjson for encoding requests and decoding responses when it is installed
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+    
+    def _dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
 # Configuration
 BASE_URL = "http://localhost:5000"
 TEST_ENABLED = True
 
-def test_userstats_webhook():
-    """Test USERSTATS webhook endpoint"""
-    print("🧪 Testing USERSTATS webhook...")
-    
-    # Sample USERSTATS data based on DCSServerBot format
-    userstats_data = {
-        "player_name": "TestPilot",
-        "player_ucid": "test_ucid_12345",
-        "player_id": 12345,
-        "server_name": "Test DCS Server",
-        "mission_name": "Operation Test Mission",
-        "mission_id": "test_mission_001",
-        "flight_time": 3600,  # 1 hour in seconds
-        "kills": {
-            "air": 2,
-            "ground": 3,
-            "friendly": 0
+# Request headers shared by all webhook POSTs
+JSON_HEADERS = {"Content-Type": "application/json"}
+SIGNED_JSON_HEADERS = {**JSON_HEADERS, "X-DCS-Signature": "test_signature"}
+
+def _requests():
+    """The requests module, imported on first use so loading this script stays cheap"""
+    import requests
+    return requests
+
+# Timestamp shared by all sample payloads in this run
+NOW_ISO = datetime.now(timezone.utc).isoformat()
+
+# Sample USERSTATS data based on DCSServerBot format (timestamp added per request)
+USERSTATS_TEMPLATE = {
+    "player_name": "TestPilot",
+    "player_ucid": "test_ucid_12345",
+    "player_id": 12345,
+    "server_name": "Test DCS Server",
+    "mission_name": "Operation Test Mission",
+    "mission_id": "test_mission_001",
+    "flight_time": 3600,  # 1 hour in seconds
+    "kills": {
+        "air": 2,
+        "ground": 3,
+        "friendly": 0
+    },
+    "deaths": 1,
+    "ejections": 0,
+    "crashes": 0,
+    "aircraft_type": "F-16C",
+    "side": "blue"
+}
+
+# Sample MISSIONSTATS data based on DCSServerBot format (start/end times added per request)
+MISSIONSTATS_TEMPLATE = {
+    "mission_name": "Operation Test Mission",
+    "mission_id": "test_mission_001",
+    "server_name": "Test DCS Server",
+    "duration": 7200,  # 2 hours in seconds
+    "players": [
+        {
+            "name": "TestPilot1",
+            "ucid": "test_ucid_1",
+            "flight_time": 3600,
+            "kills": {"air": 2, "ground": 1},
+            "deaths": 1,
+            "ejections": 0,
+            "aircraft": "F-16C"
         },
-        "deaths": 1,
-        "ejections": 0,
-        "crashes": 0,
-        "aircraft_type": "F-16C",
-        "side": "blue",
-        "timestamp": datetime.now(timezone.utc).isoformat()
+        {
+            "name": "TestPilot2",
+            "ucid": "test_ucid_2",
+            "flight_time": 1800,
+            "kills": {"air": 1, "ground": 2},
+            "deaths": 0,
+            "ejections": 0,
+            "aircraft": "F/A-18C"
+        }
+    ],
+    "statistics": {
+        "total_kills": 6,
+        "total_deaths": 1,
+        "total_flight_time": 5400,
+        "aircraft_used": ["F-16C", "F/A-18C"]
     }
+}
+
+# Request bodies are serialized once, since NOW_ISO is fixed for the run
+USERSTATS_BODY = _dumps({**USERSTATS_TEMPLATE, "timestamp": NOW_ISO})
+MISSIONSTATS_BODY = _dumps({**MISSIONSTATS_TEMPLATE, "start_time": NOW_ISO, "end_time": NOW_ISO})
+
+def test_userstats_webhook():
+    """Test USERSTATS webhook endpoint"""
+    lines = ["🧪 Testing USERSTATS webhook..."]
     
     try:
-        response = requests.post(
+        response = _requests().post(
             f"{BASE_URL}/dcs/userstats",
-            json=userstats_data,
-            headers={
-                "Content-Type": "application/json",
-                "X-DCS-Signature": "test_signature"
-            },
+            data=USERSTATS_BODY,
+            headers=SIGNED_JSON_HEADERS,
             timeout=10
         )
         
-        print(f"Status Code: {response.status_code}")
-        print(f"Response: {response.json()}")
+        lines.append(f"Status Code: {response.status_code}")
+        lines.append(f"Response: {_loads(response.content)}")
         
         if response.status_code == 200:
-            print("✅ USERSTATS webhook test passed!")
+            lines.append("✅ USERSTATS webhook test passed!")
+            print("\n".join(lines))
             return True
         else:
-            print("❌ USERSTATS webhook test failed!")
+            lines.append("❌ USERSTATS webhook test failed!")
+            print("\n".join(lines))
             return False
             
-    except requests.exceptions.RequestException as e:
-        print(f"❌ USERSTATS webhook test failed with error: {e}")
+    except _requests().exceptions.RequestException as e:
+        lines.append(f"❌ USERSTATS webhook test failed with error: {e}")
+        print("\n".join(lines))
         return False
 
 def test_missionstats_webhook():
     """Test MISSIONSTATS webhook endpoint"""
-    print("\n🧪 Testing MISSIONSTATS webhook...")
-    
-    # Sample MISSIONSTATS data based on DCSServerBot format
-    missionstats_data = {
-        "mission_name": "Operation Test Mission",
-        "mission_id": "test_mission_001",
-        "server_name": "Test DCS Server",
-        "start_time": datetime.now(timezone.utc).isoformat(),
-        "end_time": datetime.now(timezone.utc).isoformat(),
-        "duration": 7200,  # 2 hours in seconds
-        "players": [
-            {
-                "name": "TestPilot1",
-                "ucid": "test_ucid_1",
-                "flight_time": 3600,
-                "kills": {"air": 2, "ground": 1},
-                "deaths": 1,
-                "ejections": 0,
-                "aircraft": "F-16C"
-            },
-            {
-                "name": "TestPilot2",
-                "ucid": "test_ucid_2",
-                "flight_time": 1800,
-                "kills": {"air": 1, "ground": 2},
-                "deaths": 0,
-                "ejections": 0,
-                "aircraft": "F/A-18C"
-            }
-        ],
-        "statistics": {
-            "total_kills": 6,
-            "total_deaths": 1,
-            "total_flight_time": 5400,
-            "aircraft_used": ["F-16C", "F/A-18C"]
-        }
-    }
+    lines = ["\n🧪 Testing MISSIONSTATS webhook..."]
     
     try:
-        response = requests.post(
+        response = _requests().post(
             f"{BASE_URL}/dcs/missionstats",
-            json=missionstats_data,
-            headers={
-                "Content-Type": "application/json",
-                "X-DCS-Signature": "test_signature"
-            },
+            data=MISSIONSTATS_BODY,
+            headers=SIGNED_JSON_HEADERS,
             timeout=10
         )
         
-        print(f"Status Code: {response.status_code}")
-        print(f"Response: {response.json()}")
+        lines.append(f"Status Code: {response.status_code}")
+        lines.append(f"Response: {_loads(response.content)}")
         
         if response.status_code == 200:
-            print("✅ MISSIONSTATS webhook test passed!")
+            lines.append("✅ MISSIONSTATS webhook test passed!")
+            print("\n".join(lines))
             return True
         else:
-            print("❌ MISSIONSTATS webhook test failed!")
+            lines.append("❌ MISSIONSTATS webhook test failed!")
+            print("\n".join(lines))
             return False
             
-    except requests.exceptions.RequestException as e:
-        print(f"❌ MISSIONSTATS webhook test failed with error: {e}")
+    except _requests().exceptions.RequestException as e:
+        lines.append(f"❌ MISSIONSTATS webhook test failed with error: {e}")
+        print("\n".join(lines))
         return False
 
 def test_health_endpoint():
@@ -136,10 +160,10 @@ def test_health_endpoint():
     print("\n🏥 Testing health endpoint...")
     
     try:
-        response = requests.get(f"{BASE_URL}/health", timeout=5)
+        response = _requests().get(f"{BASE_URL}/health", timeout=5)
         
         if response.status_code == 200:
-            health_data = response.json()
+            health_data = _loads(response.content)
             print(f"Health Status: {health_data}")
             
             dcs_bot_enabled = health_data.get("dcs_bot_enabled", False)
@@ -153,10 +177,23 @@ def test_health_endpoint():
             print(f"❌ Health check failed with status {response.status_code}")
             return False
             
-    except requests.exceptions.RequestException as e:
+    except _requests().exceptions.RequestException as e:
         print(f"❌ Health check failed with error: {e}")
         return False
 
+def _post_invalid(endpoint, body):
+    """POST an invalid payload and return (endpoint, status_code or RequestException)"""
+    try:
+        response = _requests().post(
+            f"{BASE_URL}{endpoint}",
+            data=_dumps(body),
+            headers=JSON_HEADERS,
+            timeout=10
+        )
+        return endpoint, response.status_code
+    except _requests().exceptions.RequestException as e:
+        return endpoint, e
+
 def test_invalid_data():
     """Test webhook endpoints with invalid data"""
     print("\n🧪 Testing invalid data handling...")
@@ -167,45 +204,31 @@ def test_invalid_data():
         # Missing required fields
     }
     
-    try:
-        response = requests.post(
-            f"{BASE_URL}/dcs/userstats",
-            json=invalid_userstats,
-            headers={"Content-Type": "application/json"},
-            timeout=10
-        )
-        
-        print(f"Invalid USERSTATS Status: {response.status_code}")
-        if response.status_code == 400:
-            print("✅ Invalid USERSTATS data properly rejected!")
-        else:
-            print("❌ Invalid USERSTATS data not properly rejected!")
-            
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Invalid USERSTATS test failed: {e}")
-    
     # Test MISSIONSTATS with missing required fields
     invalid_missionstats = {
         "mission_name": "Test Mission"
         # Missing required fields
     }
     
-    try:
-        response = requests.post(
-            f"{BASE_URL}/dcs/missionstats",
-            json=invalid_missionstats,
-            headers={"Content-Type": "application/json"},
-            timeout=10
-        )
+    # The probes are independent, so send them concurrently
+    probes = [
+        ("/dcs/userstats", invalid_userstats),
+        ("/dcs/missionstats", invalid_missionstats),
+    ]
+    with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+        results = list(executor.map(lambda probe: _post_invalid(*probe), probes))
+    
+    for endpoint, result in results:
+        label = endpoint.rsplit("/", 1)[-1].upper()
+        if isinstance(result, Exception):
+            print(f"❌ Invalid {label} test failed: {result}")
+            continue
         
-        print(f"Invalid MISSIONSTATS Status: {response.status_code}")
-        if response.status_code == 400:
-            print("✅ Invalid MISSIONSTATS data properly rejected!")
+        print(f"Invalid {label} Status: {result}")
+        if result == 400:
+            print(f"✅ Invalid {label} data properly rejected!")
         else:
-            print("❌ Invalid MISSIONSTATS data not properly rejected!")
-            
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Invalid MISSIONSTATS test failed: {e}")
+            print(f"❌ Invalid {label} data not properly rejected!")
 
 def main():
     """Run all tests"""
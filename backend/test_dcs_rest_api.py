@@ -9,10 +9,22 @@ with the Loggers DCS Squadron Logbook backend.
 import os
 import sys
 import json
-import requests
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
+# Prefer orjson for encoding requests and decoding responses when it is installed
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+    
+    def _dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
 # Add the backend directory to the Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -20,6 +32,31 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 LOGGERS_BASE_URL = "http://localhost:5000"
 DCS_REST_API_TOKEN = "loggers_rest_api_token_2024"
 TEST_TIMEOUT = 10
+MAX_WORKERS = 6
+
+def _requests():
+    """The requests module, imported on first use so loading this script stays cheap"""
+    import requests
+    return requests
+
+# Serialize output from concurrently running endpoint tests
+_print_lock = threading.Lock()
+
+# One keep-alive session per worker thread (requests.Session is not thread-safe)
+_thread_local = threading.local()
+
+def get_session():
+    """Get the HTTP session for the current thread"""
+    session = getattr(_thread_local, 'session', None)
+    if session is None:
+        session = _requests().Session()
+        _thread_local.session = session
+    return session
+
+def safe_print(*args, **kwargs):
+    """Print while holding the output lock"""
+    with _print_lock:
+        print(*args, **kwargs)
 
 def make_request(method, endpoint, data=None, headers=None):
     """Make HTTP request to Loggers backend"""
@@ -31,127 +68,151 @@ def make_request(method, endpoint, data=None, headers=None):
     if DCS_REST_API_TOKEN:
         headers['Authorization'] = f'Bearer {DCS_REST_API_TOKEN}'
     
+    session = get_session()
+    
     try:
         if method.upper() == 'GET':
-            response = requests.get(url, headers=headers, timeout=TEST_TIMEOUT)
+            response = session.get(url, headers=headers, timeout=TEST_TIMEOUT)
         elif method.upper() == 'POST':
-            response = requests.post(url, json=data, headers=headers, timeout=TEST_TIMEOUT)
+            body = None
+            if data is not None:
+                headers['Content-Type'] = 'application/json'
+                body = _dumps(data)
+            response = session.post(url, data=body, headers=headers, timeout=TEST_TIMEOUT)
         else:
-            print(f"❌ Unsupported method: {method}")
+            safe_print(f"❌ Unsupported method: {method}")
             return None
         
         return response
         
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Request failed: {e}")
+    except _requests().exceptions.RequestException as e:
+        safe_print(f"❌ Request failed: {e}")
         return None
 
-def test_endpoint(name, method, endpoint, data=None, expected_status=200):
-    """Test a specific endpoint"""
-    print(f"\n🧪 Testing {name}...")
-    print(f"   {method} {endpoint}")
+def _maybe_json(response):
+    """Decode a JSON response body, or return None if the body is not JSON"""
+    if not response.headers.get('content-type', '').startswith('application/json'):
+        return None
+    try:
+        return _loads(response.content)
+    except ValueError:
+        return None
+
+def test_endpoint(name, method, endpoint, data=None, expected_status=200, responses=None):
+    """Test a specific endpoint, recording the decoded body in responses if given"""
+    lines = []
+    try:
+        lines.append(f"\n🧪 Testing {name}...")
+        lines.append(f"   {method} {endpoint}")
     
-    response = make_request(method, endpoint, data)
+        response = make_request(method, endpoint, data)
     
-    if response is None:
-        print(f"❌ {name}: Request failed")
-        return False
+        if response is None:
+            lines.append(f"❌ {name}: Request failed")
+            return False
     
-    if response.status_code == expected_status:
-        print(f"✅ {name}: Success (Status: {response.status_code})")
+        if response.status_code == expected_status:
+            lines.append(f"✅ {name}: Success (Status: {response.status_code})")
         
-        try:
-            result = response.json()
-            if 'request_id' in result:
-                print(f"   Request ID: {result['request_id']}")
-            
-            # Print relevant data for different endpoints
-            if 'server' in result:
-                server = result['server']
-                print(f"   Server: {server.get('name', 'N/A')}")
-                print(f"   Mission: {server.get('mission_name', 'N/A')}")
-                print(f"   Players: {server.get('players_count', 0)}/{server.get('max_players', 0)}")
+            result = _maybe_json(response)
+            if result is None:
+                lines.append(f"   Response: {response.text[:200]}...")
+            else:
+                if responses is not None:
+                    responses[endpoint] = result
+                if 'request_id' in result:
+                    lines.append(f"   Request ID: {result['request_id']}")
             
-            elif 'players' in result:
-                players = result['players']
-                print(f"   Players: {len(players)}")
-                for player in players[:3]:  # Show first 3 players
-                    print(f"     - {player.get('name', 'N/A')} ({player.get('unit_type', 'N/A')})")
-                if len(players) > 3:
-                    print(f"     ... and {len(players) - 3} more")
+                # Print relevant data for different endpoints
+                if 'server' in result:
+                    server = result['server']
+                    lines.append(f"   Server: {server.get('name', 'N/A')}")
+                    lines.append(f"   Mission: {server.get('mission_name', 'N/A')}")
+                    lines.append(f"   Players: {server.get('players_count', 0)}/{server.get('max_players', 0)}")
             
-            elif 'mission' in result:
-                mission = result['mission']
-                print(f"   Mission: {mission.get('name', 'N/A')}")
-                print(f"   Theatre: {mission.get('theatre', 'N/A')}")
-                print(f"   Duration: {mission.get('duration', 0)} seconds")
+                elif 'players' in result:
+                    players = result['players']
+                    lines.append(f"   Players: {len(players)}")
+                    for player in players[:3]:  # Show first 3 players
+                        lines.append(f"     - {player.get('name', 'N/A')} ({player.get('unit_type', 'N/A')})")
+                    if len(players) > 3:
+                        lines.append(f"     ... and {len(players) - 3} more")
             
-            elif 'missions' in result:
-                missions = result['missions']
-                print(f"   Available missions: {len(missions)}")
-                for mission in missions[:3]:  # Show first 3 missions
-                    print(f"     - {mission}")
-                if len(missions) > 3:
-                    print(f"     ... and {len(missions) - 3} more")
+                elif 'mission' in result:
+                    mission = result['mission']
+                    lines.append(f"   Mission: {mission.get('name', 'N/A')}")
+                    lines.append(f"   Theatre: {mission.get('theatre', 'N/A')}")
+                    lines.append(f"   Duration: {mission.get('duration', 0)} seconds")
             
-            elif 'stats' in result:
-                stats = result['stats']
-                print(f"   Server stats retrieved successfully")
-                print(f"   Keys: {', '.join(stats.keys())}")
+                elif 'missions' in result:
+                    missions = result['missions']
+                    lines.append(f"   Available missions: {len(missions)}")
+                    for mission in missions[:3]:  # Show first 3 missions
+                        lines.append(f"     - {mission}")
+                    if len(missions) > 3:
+                        lines.append(f"     ... and {len(missions) - 3} more")
             
-            elif 'message' in result:
-                print(f"   Message: {result['message']}")
+                elif 'stats' in result:
+                    stats = result['stats']
+                    lines.append(f"   Server stats retrieved successfully")
+                    lines.append(f"   Keys: {', '.join(stats.keys())}")
             
-        except json.JSONDecodeError:
-            print(f"   Response: {response.text[:200]}...")
+                elif 'message' in result:
+                    lines.append(f"   Message: {result['message']}")
         
-        return True
+            return True
     
-    else:
-        print(f"❌ {name}: Failed (Status: {response.status_code})")
-        try:
-            error_data = response.json()
-            if 'error' in error_data:
+        else:
+            lines.append(f"❌ {name}: Failed (Status: {response.status_code})")
+            error_data = _maybe_json(response)
+            if error_data is None:
+                lines.append(f"   Response: {response.text[:200]}...")
+            elif 'error' in error_data:
                 error = error_data['error']
-                print(f"   Error: {error.get('message', 'Unknown error')}")
-                print(f"   Code: {error.get('code', 'N/A')}")
-        except json.JSONDecodeError:
-            print(f"   Response: {response.text[:200]}...")
+                lines.append(f"   Error: {error.get('message', 'Unknown error')}")
+                lines.append(f"   Code: {error.get('code', 'N/A')}")
         
-        return False
+            return False
+    finally:
+        safe_print("\n".join(lines))
 
 def test_health_check():
     """Test the health check endpoint"""
-    print("\n🏥 Testing Health Check...")
+    lines = []
+    try:
+        lines.append("\n🏥 Testing Health Check...")
     
-    response = make_request('GET', '/health')
+        response = make_request('GET', '/health')
     
-    if response is None:
-        print("❌ Health check: Request failed")
-        return False
+        if response is None:
+            lines.append("❌ Health check: Request failed")
+            return False
     
-    if response.status_code == 200:
-        try:
-            data = response.json()
-            print(f"✅ Health check: Success")
-            print(f"   Status: {data.get('status', 'N/A')}")
-            print(f"   DCS Bot Enabled: {data.get('dcs_bot_enabled', 'N/A')}")
-            print(f"   DCS REST API Enabled: {data.get('dcs_rest_api_enabled', 'N/A')}")
+        if response.status_code == 200:
+            data = _maybe_json(response)
+            if data is None:
+                lines.append(f"❌ Health check: Invalid JSON response")
+                return False
+            lines.append(f"✅ Health check: Success")
+            lines.append(f"   Status: {data.get('status', 'N/A')}")
+            lines.append(f"   DCS Bot Enabled: {data.get('dcs_bot_enabled', 'N/A')}")
+            lines.append(f"   DCS REST API Enabled: {data.get('dcs_rest_api_enabled', 'N/A')}")
             return True
-        except json.JSONDecodeError:
-            print(f"❌ Health check: Invalid JSON response")
+        else:
+            lines.append(f"❌ Health check: Failed (Status: {response.status_code})")
             return False
-    else:
-        print(f"❌ Health check: Failed (Status: {response.status_code})")
-        return False
+    finally:
+        print("\n".join(lines))
 
 def main():
     """Main test function"""
+    started_at = datetime.now().isoformat()
+    
     print("🚀 DCS Server Bot REST API Integration Test")
     print("=" * 50)
     print(f"Target URL: {LOGGERS_BASE_URL}")
     print(f"Token: {DCS_REST_API_TOKEN[:10]}..." if DCS_REST_API_TOKEN else "Token: None")
-    print(f"Timestamp: {datetime.now().isoformat()}")
+    print(f"Timestamp: {started_at}")
     
     # Test health check first
     if not test_health_check():
@@ -166,41 +227,46 @@ def main():
         ("Available Missions", "GET", "/dcs/server/missions"),
         ("Server Statistics", "GET", "/dcs/server/stats"),
         ("Send Chat Message", "POST", "/dcs/server/chat", {
-            "message": f"Test message from Loggers at {datetime.now().isoformat()}",
+            "message": f"Test message from Loggers at {started_at}",
             "coalition": "all"
         }),
         ("Restart Mission", "POST", "/dcs/server/mission/restart"),
     ]
     
-    # Test player info endpoint if we have players
-    print("\n🔍 Checking for players to test player info endpoint...")
-    response = make_request('GET', '/dcs/server/players')
-    if response and response.status_code == 200:
-        try:
-            data = response.json()
-            players = data.get('players', [])
-            if players:
-                player_id = players[0].get('id', players[0].get('ucid', 'test'))
-                tests.append(("Player Information", "GET", f"/dcs/server/players/{player_id}"))
-                print(f"   Found player: {players[0].get('name', 'Unknown')} (ID: {player_id})")
-            else:
-                print("   No players found, skipping player info test")
-        except json.JSONDecodeError:
-            print("   Could not parse players response")
+    # Read-only endpoints have no ordering dependency, so run them concurrently;
+    # mutating endpoints run afterwards, one at a time, to preserve server state
+    read_only = [test for test in tests if test[1] == "GET"]
+    mutating = [test for test in tests if test[1] != "GET"]
     
-    # Run all tests
     passed = 0
     total = len(tests)
+    responses = {}
     
-    for test in tests:
-        if len(test) == 4:
-            name, method, endpoint, data = test
-            if test_endpoint(name, method, endpoint, data):
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = [executor.submit(test_endpoint, *test, responses=responses) for test in read_only]
+        for future in as_completed(futures):
+            if future.result():
                 passed += 1
-        else:
-            name, method, endpoint = test
-            if test_endpoint(name, method, endpoint):
+    
+    # Test player info endpoint if the players test returned any players
+    print("\n🔍 Checking for players to test player info endpoint...")
+    players_result = responses.get('/dcs/server/players')
+    if players_result is None:
+        print("   Players response unavailable, skipping player info test")
+    else:
+        players = players_result.get('players', [])
+        if players:
+            player_id = players[0].get('id', players[0].get('ucid', 'test'))
+            print(f"   Found player: {players[0].get('name', 'Unknown')} (ID: {player_id})")
+            total += 1
+            if test_endpoint("Player Information", "GET", f"/dcs/server/players/{player_id}"):
                 passed += 1
+        else:
+            print("   No players found, skipping player info test")
+    
+    for test in mutating:
+        if test_endpoint(*test):
+            passed += 1
     
     # Summary
     print("\n" + "=" * 50)
@@ -1,7 +1,37 @@
 #!/usr/bin/env python3
 
-from xml_parser import parse_xml
-from update_profiles import update_profiles_from_data
+import os
+from pathlib import Path
+
+from error_handling import _loads
+
+PROFILE_DIR = 'pilot_profiles'
+SAMPLE_PROFILE_NAME = 'six.json'
+
+# Fields shown for each pilot, with the value used when a field is missing
+PILOT_DISPLAY_DEFAULTS = {
+    'platform': 'Unknown',
+    'aircraft': 'Unknown',
+    'nicknames': [],
+    'flight_minutes': 0,
+    'aa_kills': 0,
+    'ag_kills': 0,
+    'rtb': 0,
+    'ejections': 0,
+    'kia': 0,
+}
+
+PILOT_BLOCK_TEMPLATE = """
+{index}. {pilot_name}:
+   Platform: {platform}
+   Aircraft: {aircraft}
+   Nicknames: {nicknames}
+   Flight time: {flight_minutes} minutes ({flight_hhmm})
+   AA kills: {aa_kills}
+   AG kills: {ag_kills}
+   RTB: {rtb}
+   Ejections: {ejections}
+   KIA: {kia}"""
 
 def format_minutes_to_hhmm(minutes):
     """Convert minutes to HH:MM format for display"""
@@ -10,42 +40,53 @@ def format_minutes_to_hhmm(minutes):
     return f"{hours}:{mins:02d}"
 
 def test_enhanced_parsing():
-    print("Testing enhanced XML parsing...")
-    result = parse_xml('testData.xml')
+    # Deferred so importing this module does not load the parser stack
+    from xml_parser import parse_xml
+    from update_profiles import update_profiles_from_data
     
-    if result.get('success'):
-        pilots = result.get('pilot_data', {})
-        print(f"Total pilots found: {len(pilots)}")
-        
-        for i, (pilot_name, pilot_data) in enumerate(pilots.items(), 1):
-            flight_minutes = pilot_data.get('flight_minutes', 0)
-            print(f"\n{i}. {pilot_name}:")
-            print(f"   Platform: {pilot_data.get('platform', 'Unknown')}")
-            print(f"   Aircraft: {pilot_data.get('aircraft', 'Unknown')}")
-            print(f"   Nicknames: {pilot_data.get('nicknames', [])}")
-            print(f"   Flight time: {flight_minutes} minutes ({format_minutes_to_hhmm(flight_minutes)})")
-            print(f"   AA kills: {pilot_data.get('aa_kills', 0)}")
-            print(f"   AG kills: {pilot_data.get('ag_kills', 0)}")
-            print(f"   RTB: {pilot_data.get('rtb', 0)}")
-            print(f"   Ejections: {pilot_data.get('ejections', 0)}")
-            print(f"   KIA: {pilot_data.get('kia', 0)}")
-        
-        # Test profile generation
-        print(f"\nGenerating profiles...")
-        update_profiles_from_data(pilots)
-        print("✅ Profiles generated successfully!")
-        
-        # Show sample profile data
-        print(f"\nSample profile data (six.json):")
-        import json
-        with open('pilot_profiles/six.json', 'r') as f:
-            profile = json.load(f)
-            print(f"  Platform hours (minutes): {profile['platform_hours']}")
-            print(f"  Aircraft hours (minutes): {profile['aircraft_hours']}")
-            print(f"  Mission flight time: {profile['missions'][0]['flight_minutes']} minutes")
+    lines = ["Testing enhanced XML parsing..."]
+    try:
+        result = parse_xml('testData.xml')
         
-    else:
-        print(f"Error: {result.get('error')}")
+        if result.get('success'):
+            pilots = result.get('pilot_data', {})
+            lines.append(f"Total pilots found: {len(pilots)}")
+            
+            for i, (pilot_name, pilot_data) in enumerate(pilots.items(), 1):
+                fields = {**PILOT_DISPLAY_DEFAULTS, **pilot_data}
+                lines.append(PILOT_BLOCK_TEMPLATE.format(
+                    index=i,
+                    pilot_name=pilot_name,
+                    flight_hhmm=format_minutes_to_hhmm(fields['flight_minutes']),
+                    **fields
+                ))
+            
+            # Test profile generation
+            lines.append(f"\nGenerating profiles...")
+            update_profiles_from_data(pilots)
+            lines.append("✅ Profiles generated successfully!")
+            
+            # Count profiles from the directory listing; only the sample is read
+            with os.scandir(PROFILE_DIR) as entries:
+                profile_count = sum(
+                    1 for entry in entries
+                    if entry.name.endswith('.json') and entry.name != 'index.json'
+                )
+            lines.append(f"Profiles on disk: {profile_count}")
+            
+            # Show sample profile data
+            lines.append(f"\nSample profile data ({SAMPLE_PROFILE_NAME}):")
+            sample_path = Path(PROFILE_DIR) / SAMPLE_PROFILE_NAME
+            assert sample_path.exists(), f"Sample profile {SAMPLE_PROFILE_NAME} was not generated in {PROFILE_DIR}"
+            profile = _loads(sample_path.read_bytes())
+            lines.append(f"  Platform hours (minutes): {profile['platform_hours']}")
+            lines.append(f"  Aircraft hours (minutes): {profile['aircraft_hours']}")
+            lines.append(f"  Mission flight time: {profile['missions'][0]['flight_minutes']} minutes")
+            
+        else:
+            lines.append(f"Error: {result.get('error')}")
+    finally:
+        print("\n".join(lines))
 
 if __name__ == "__main__":
     test_enhanced_parsing() 
\ No newline at end of file
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+from collections import defaultdict
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import xml_parser
+from error_handling import APIError
+from xml_parser import process_event, new_pilot_missions, new_position_track
+
+SQUADRON_CALLSIGNS = ("six", "bones")
+
+DESTROYED_BY_PLAYER = """
+<Event>
+    <Time>10</Time>
+    <PrimaryObject>
+        <Pilot>Six</Pilot><Name>OH-58D Kiowa Warrior</Name><Coalition>Blue</Coalition>
+    </PrimaryObject>
+    <SecondaryObject><Pilot>Bones</Pilot><Coalition>Red</Coalition></SecondaryObject>
+    <Action>HasBeenDestroyed</Action>
+</Event>
+"""
+
+DESTROYED_ALONE = """
+<Event>
+    <Time>10</Time>
+    <PrimaryObject><Pilot>Six</Pilot><Name>OH-58D Kiowa Warrior</Name></PrimaryObject>
+    <Action>HasBeenDestroyed</Action>
+</Event>
+"""
+
+def run_event(xml):
+    pilot_missions = new_pilot_missions("Test Mission", "2025-01-01", 10, "DCS")
+    process_event(ET.fromstring(xml), pilot_missions, defaultdict(new_position_track), {},
+                  squadron_callsigns=SQUADRON_CALLSIGNS)
+    return pilot_missions
+
+@pytest.mark.parametrize("xml", [DESTROYED_BY_PLAYER, DESTROYED_ALONE], ids=["attacker", "no attacker"])
+def test_destroyed_pilot_is_killed(xml):
+    victim = run_event(xml)["six"]
+    assert (victim["kia"], victim["deaths"]) == (1, 1)
+
+def test_attacker_is_credited():
+    attacker = run_event(DESTROYED_BY_PLAYER)["bones"]
+    assert (attacker["aa_kills"], attacker["kia"]) == (1, 0)
+
+DUPLICATE_MISSION = b"""<?xml version="1.0" encoding="UTF-8"?>
+<Tacview>
+    <Events>
+        <Event><Time>10</Time><PrimaryObject><Pilot>Six</Pilot></PrimaryObject><Action>HasTakenOff</Action></Event>
+        <Event><Broken</Events>
+"""
+
+@pytest.fixture
+def already_processed(monkeypatch):
+    monkeypatch.setattr(xml_parser, "is_mission_already_processed", lambda name, date: True)
+
+def test_validated_duplicate_is_still_parsed(tmp_path, already_processed):
+    xml_path = tmp_path / "duplicate.xml"
+    xml_path.write_bytes(DUPLICATE_MISSION)
+    with pytest.raises(APIError):
+        xml_parser.parse_tacview_xml(str(xml_path), validate=True)
+
+def test_well_formed_duplicate_is_reported(tmp_path, already_processed):
+    xml_path = tmp_path / "duplicate.xml"
+    xml_path.write_bytes(DUPLICATE_MISSION.replace(b"<Event><Broken</Events>", b"</Events>\n</Tacview>"))
+    result = xml_parser.parse_tacview_xml(str(xml_path), validate=True)
+    assert result["duplicate"] is True
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -1,27 +1,27 @@
 #!/usr/bin/env python3
 
+import pytest
+
 from xml_parser import is_player_client
 
+# Squadron roster as shipped in config/squadron_callsigns.json
+SQUADRON_CALLSIGNS = ["drunkbonsai", "machinegun", "bullet", "fatal", "six", "bones"]
+
 # Test cases based on the XML structure we found
+# Static Armor* and Ground-* units are AI, squadron pilots are players
 test_cases = [
-    ("Static Armor RED-B-7-1", "Tank", ""),
-    ("Static Armor RED-A-4", "Tank", ""),
-    ("Static Armor RED-DECOY-B-4", "Infantry", ""),
-    ("Ground-7-1", "Humvee", ""),
-    ("Katana 1-1 Jediknight", "F-16C Fighting Falcon", ""),
-    ("Gunner 1 | Machinegun817", "Mi-24P Hind-F", ""),
-    ("(HHC/229) Six", "OH-58D Kiowa Warrior", ""),
+    ("Static Armor RED-B-7-1", "Tank", "", False),
+    ("Static Armor RED-A-4", "Tank", "", False),
+    ("Static Armor RED-DECOY-B-4", "Infantry", "", False),
+    ("Ground-7-1", "Humvee", "", False),
+    ("Katana 1-1 Jediknight", "F-16C Fighting Falcon", "", False),  # not on the roster
+    ("Gunner 1 | Machinegun817", "Mi-24P Hind-F", "", True),
+    ("(HHC/229) Six", "OH-58D Kiowa Warrior", "", True),
 ]
 
-print("Testing pilot filtering:")
-print("=" * 50)
-
-for pilot, aircraft, group in test_cases:
-    result = is_player_client(pilot, aircraft, group)
-    status = "PLAYER" if result else "AI"
-    print(f"'{pilot}' -> {status}")
+@pytest.mark.parametrize("pilot,aircraft,group,expected", test_cases)
+def test_is_player_client(pilot, aircraft, group, expected):
+    assert is_player_client(pilot, aircraft, group, SQUADRON_CALLSIGNS) is expected
 
-print("\nExpected results:")
-print("- Static Armor* -> AI")
-print("- Ground-* -> AI") 
-print("- Real player names -> PLAYER") 
\ No newline at end of file
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -4,7 +4,6 @@ import os
 import json
 import time
 from unittest.mock import patch, MagicMock
-from io import BytesIO
 
 from flask import Flask
 from flask_limiter import Limiter
@@ -16,6 +15,22 @@ from security_config import (
     validate_origin, validate_file_extension, validate_mime_type,
     get_security_headers, get_security_summary
 )
+from app import validate_file_size
+
+class FakeLargeFile:
+    """Upload stand-in that reports a size without holding the bytes"""
+    
+    filename = 'test.xml'
+    
+    def __init__(self, size):
+        self.size = size
+        self._pos = 0
+    
+    def seek(self, offset, whence=0):
+        self._pos = self.size + offset if whence == 2 else offset
+    
+    def tell(self):
+        return self._pos
 
 class TestSecurityConfig(unittest.TestCase):
     """Test cases for security configuration"""
@@ -85,13 +100,12 @@ class TestSecurityConfig(unittest.TestCase):
         self.assertTrue(len(headers) > 0)
         
         # Check for common security headers
-        expected_headers = [
+        expected_headers = {
             'X-Content-Type-Options',
             'X-Frame-Options',
             'X-XSS-Protection'
-        ]
-        for header in expected_headers:
-            self.assertIn(header, headers)
+        }
+        self.assertLessEqual(expected_headers, headers.keys())
     
     def test_get_security_summary(self):
         """Test getting security summary"""
@@ -99,55 +113,64 @@ class TestSecurityConfig(unittest.TestCase):
         self.assertIsInstance(summary, dict)
         
         # Check required keys
-        required_keys = ['rate_limits', 'cors', 'upload', 'security_headers']
-        for key in required_keys:
-            self.assertIn(key, summary)
+        required_keys = {'rate_limits', 'cors', 'upload', 'security_headers'}
+        self.assertLessEqual(required_keys, summary.keys())
         
         # Check rate limits
-        rate_limits = summary['rate_limits']
-        self.assertIn('default', rate_limits)
-        self.assertIn('upload', rate_limits)
-        self.assertIn('discord', rate_limits)
+        self.assertLessEqual({'default', 'upload', 'discord'}, summary['rate_limits'].keys())
         
         # Check upload config
-        upload = summary['upload']
-        self.assertIn('max_file_size_mb', upload)
-        self.assertIn('max_json_size_mb', upload)
-        self.assertIn('allowed_extensions', upload)
+        self.assertLessEqual(
+            {'max_file_size_mb', 'max_json_size_mb', 'allowed_extensions'},
+            summary['upload'].keys()
+        )
 
 class TestSecurityIntegration(unittest.TestCase):
     """Test security features integration"""
     
-    def setUp(self):
-        """Set up test Flask app with security features"""
-        self.app = Flask(__name__)
-        self.app.config['TESTING'] = True
+    @classmethod
+    def setUpClass(cls):
+        """Set up one test Flask app with security features for the whole class"""
+        cls.app = Flask(__name__)
+        cls.app.config['TESTING'] = True
         
         # Initialize rate limiter
-        self.limiter = Limiter(
-            app=self.app,
+        cls.limiter = Limiter(
+            app=cls.app,
             key_func=get_remote_address,
             default_limits=['10 per minute'],
             storage_uri="memory://"
         )
         
         # Configure CORS
-        CORS(self.app, 
+        CORS(cls.app, 
              origins=['http://localhost:3000'],
              methods=['GET', 'POST'],
              allow_headers=['Content-Type'])
         
+        # Add security headers middleware (must be registered before the first request)
+        @cls.app.after_request
+        def add_security_headers(response):
+            security_headers = get_security_headers()
+            for header, value in security_headers.items():
+                response.headers[header] = value
+            return response
+        
         # Add test routes
-        @self.app.route('/test')
-        @self.limiter.limit('5 per minute')
+        @cls.app.route('/test')
+        @cls.limiter.limit('5 per minute')
         def test_route():
             return {'message': 'success'}
         
-        @self.app.route('/test-cors')
+        @cls.app.route('/test-cors')
         def test_cors():
             return {'message': 'cors test'}
         
-        self.client = self.app.test_client()
+        cls.client = cls.app.test_client()
+    
+    def setUp(self):
+        """Reset rate limit counters between tests"""
+        self.limiter.reset()
     
     def test_rate_limiting(self):
         """Test rate limiting functionality"""
@@ -171,14 +194,6 @@ class TestSecurityIntegration(unittest.TestCase):
     
     def test_security_headers_middleware(self):
         """Test security headers middleware"""
-        # Add security headers middleware
-        @self.app.after_request
-        def add_security_headers(response):
-            security_headers = get_security_headers()
-            for header, value in security_headers.items():
-                response.headers[header] = value
-            return response
-        
         response = self.client.get('/test-cors')
         
         # Check for security headers
@@ -199,14 +214,10 @@ class TestRequestSizeValidation(unittest.TestCase):
     def test_file_size_validation(self):
         """Test file size validation"""
         # Create a test file that's too large
-        large_content = b'x' * (get_max_file_size() + 1024)
-        large_file = BytesIO(large_content)
-        large_file.filename = 'test.xml'
+        large_file = FakeLargeFile(get_max_file_size() + 1024)
         
         # This would be tested in a real upload endpoint
         # For now, just test the validation function
-        from app import validate_file_size
-        
         with self.assertRaises(Exception):
             validate_file_size(large_file)
     
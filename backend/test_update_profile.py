@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+
+import pytest
+
+import update_profile
+from update_profile import add_to_summary, recalculate_summary, update_with_mission, load_profile
+
+MISSIONS = [
+    {"aa_kills": 2, "ag_kills": 1, "flight_minutes": 45},
+    {"aa_kills": 0, "ag_kills": 3, "flight_minutes": 30},
+]
+
+EXPECTED_SUMMARY = {"total_flights": 2, "total_aa_kills": 2, "total_ag_kills": 4, "total_minutes": 75}
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(update_profile, "PROFILE_DIR", tmp_path)
+    monkeypatch.setattr(update_profile, "_path_cache", {})
+    return tmp_path
+
+def test_add_to_summary_accumulates():
+    summary = {}
+    for mission_data in MISSIONS:
+        add_to_summary(summary, mission_data)
+    assert summary == EXPECTED_SUMMARY
+
+def test_recalculate_summary_rebuilds_from_history():
+    profile = {"missions": list(MISSIONS), "mission_summary": {"total_flights": 99}}
+    assert recalculate_summary(profile) == EXPECTED_SUMMARY
+    assert profile["mission_summary"] == EXPECTED_SUMMARY
+
+def test_update_with_mission_backfills_old_summary(profile_dir):
+    # A profile written before running totals: missions on disk, empty summary
+    update_profile.save_profile("six", {"callsign": "six", "mission_summary": {}, "missions": MISSIONS[:1]})
+    update_with_mission("six", MISSIONS[1])
+    assert load_profile("six")["mission_summary"] == EXPECTED_SUMMARY
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
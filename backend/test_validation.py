@@ -5,24 +5,32 @@ Test script for validation functions
 
 import sys
 import os
+import codecs
 sys.path.append(os.path.dirname(__file__))
 
 from validation import (
     validate_file_upload, validate_xml_content, validate_pilot_name,
     validate_callsign, validate_mission_name, validate_aircraft_name,
     validate_platform, validate_numeric_value, validate_callsigns_list,
-    sanitize_string, validate_pilot_data, validate_discord_data
+    sanitize_string, validate_pilot_data, validate_discord_data,
+    get_upload_size, MAX_FILE_SIZE, XML_SNIFF_BYTES
 )
 from werkzeug.datastructures import FileStorage
-import tempfile
+import pytest
 import xml.etree.ElementTree as ET
 
-def test_pilot_name_validation():
-    """Test pilot name validation"""
-    print("Testing pilot name validation...")
-    
-    # Valid names
-    valid_names = [
+# Over-length inputs, built once and shared by the tests below
+LONG_51 = "A" * 51
+LONG_101 = "A" * 101
+LONG_201 = "A" * 201
+LONG_1000 = "A" * 1000
+LONG_2000 = "A" * 2000
+LONG_B_51 = "B" * 51
+TOO_MANY_CALLSIGNS = ["A"] * 101
+
+# (label, validator, valid inputs, invalid inputs) for every single-argument validator
+VALIDATOR_CASES = [
+    ("pilot name", validate_pilot_name, [
         "Pilot123",
         "Test Pilot",
         "Pilot-Name",
@@ -30,165 +38,104 @@ def test_pilot_name_validation():
         "Pilot.Name",
         "Pilot | Callsign",
         "Pilot - Callsign"
-    ]
-    
-    for name in valid_names:
-        is_valid, error = validate_pilot_name(name)
-        if not is_valid:
-            print(f"❌ Valid name '{name}' failed: {error}")
-        else:
-            print(f"✅ Valid name '{name}' passed")
-    
-    # Invalid names
-    invalid_names = [
+    ], [
         "",  # Empty
-        "A" * 101,  # Too long
+        LONG_101,  # Too long
         "Pilot<script>",  # Script injection
         "Pilot; DROP TABLE users;",  # SQL injection
-    ]
-    
-    for name in invalid_names:
-        is_valid, error = validate_pilot_name(name)
-        if is_valid:
-            print(f"❌ Invalid name '{name}' should have failed")
-        else:
-            print(f"✅ Invalid name '{name}' correctly rejected: {error}")
-
-def test_callsign_validation():
-    """Test callsign validation"""
-    print("\nTesting callsign validation...")
-    
-    # Valid callsigns
-    valid_callsigns = [
+        ["Six"],  # Not a string
+    ]),
+    ("callsign", validate_callsign, [
         "Alpha1",
         "Bravo-Two",
         "Charlie_3",
         "Delta.Four",
         "Echo | Foxtrot",
         "Golf - Hotel"
-    ]
-    
-    for callsign in valid_callsigns:
-        is_valid, error = validate_callsign(callsign)
-        if not is_valid:
-            print(f"❌ Valid callsign '{callsign}' failed: {error}")
-        else:
-            print(f"✅ Valid callsign '{callsign}' passed")
-    
-    # Invalid callsigns
-    invalid_callsigns = [
+    ], [
         "",  # Empty
-        "A" * 51,  # Too long
+        LONG_51,  # Too long
         "Callsign<script>",  # Script injection
-    ]
-    
-    for callsign in invalid_callsigns:
-        is_valid, error = validate_callsign(callsign)
-        if is_valid:
-            print(f"❌ Invalid callsign '{callsign}' should have failed")
-        else:
-            print(f"✅ Invalid callsign '{callsign}' correctly rejected: {error}")
-
-def test_mission_name_validation():
-    """Test mission name validation"""
-    print("\nTesting mission name validation...")
-    
-    # Valid mission names
-    valid_missions = [
+        ["Six"],  # Not a string
+    ]),
+    ("mission name", validate_mission_name, [
         "Operation Desert Storm",
         "Mission_Alpha",
         "Test-Mission",
         "Mission.123"
-    ]
-    
-    for mission in valid_missions:
-        is_valid, error = validate_mission_name(mission)
-        if not is_valid:
-            print(f"❌ Valid mission '{mission}' failed: {error}")
-        else:
-            print(f"✅ Valid mission '{mission}' passed")
-    
-    # Invalid mission names
-    invalid_missions = [
+    ], [
         "",  # Empty
-        "A" * 201,  # Too long
+        LONG_201,  # Too long
         "Mission<script>",  # Script injection
-    ]
-    
-    for mission in invalid_missions:
-        is_valid, error = validate_mission_name(mission)
-        if is_valid:
-            print(f"❌ Invalid mission '{mission}' should have failed")
-        else:
-            print(f"✅ Invalid mission '{mission}' correctly rejected: {error}")
-
-def test_aircraft_validation():
-    """Test aircraft name validation"""
-    print("\nTesting aircraft validation...")
-    
-    # Valid aircraft
-    valid_aircraft = [
+        ["Six"],  # Not a string
+    ]),
+    ("aircraft", validate_aircraft_name, [
         "F-16C",
         "F-15E Strike Eagle",
         "F/A-18C Hornet",
         "MiG-21",
         "Su-27",
         "Unknown"
-    ]
-    
-    for aircraft in valid_aircraft:
-        is_valid, error = validate_aircraft_name(aircraft)
-        if not is_valid:
-            print(f"❌ Valid aircraft '{aircraft}' failed: {error}")
-        else:
-            print(f"✅ Valid aircraft '{aircraft}' passed")
-    
-    # Invalid aircraft
-    invalid_aircraft = [
+    ], [
         "",  # Empty
-        "A" * 101,  # Too long
+        LONG_101,  # Too long
         "Aircraft<script>",  # Script injection
-    ]
-    
-    for aircraft in invalid_aircraft:
-        is_valid, error = validate_aircraft_name(aircraft)
-        if is_valid:
-            print(f"❌ Invalid aircraft '{aircraft}' should have failed")
-        else:
-            print(f"✅ Invalid aircraft '{aircraft}' correctly rejected: {error}")
+        ["Six"],  # Not a string
+    ]),
+    ("platform", validate_platform, ["DCS", "BMS", "IL2"], [
+        "",  # Empty
+        "Unknown",
+        "DCS World",
+        "BMS Falcon",
+        {"name": "DCS"},  # Not a string
+    ]),
+    ("callsigns list", validate_callsigns_list, [
+        ["Alpha", "Bravo", "Charlie"],
+        ["Single"],
+        []
+    ], [
+        [LONG_51],  # Too long callsign
+        ["Alpha", ""],  # Empty callsign
+        ["Alpha", LONG_B_51],  # One too long
+        TOO_MANY_CALLSIGNS,  # Too many callsigns
+        ["Alpha", 7],  # Not a string
+        "not_a_list",  # Not a list
+    ]),
+]
 
-def test_platform_validation():
-    """Test platform validation"""
-    print("\nTesting platform validation...")
+def check_validator_cases(label, validator, valid_cases, invalid_cases):
+    """Run one validator over its valid and invalid inputs, returning the failing inputs"""
+    lines = [f"\nTesting {label} validation..."]
+    failures = []
     
-    # Valid platforms
-    valid_platforms = ["DCS", "BMS", "IL2"]
-    
-    for platform in valid_platforms:
-        is_valid, error = validate_platform(platform)
+    for value in valid_cases:
+        is_valid, error = validator(value)
         if not is_valid:
-            print(f"❌ Valid platform '{platform}' failed: {error}")
+            failures.append(value)
+            lines.append(f"❌ Valid {label} '{value}' failed: {error}")
         else:
-            print(f"✅ Valid platform '{platform}' passed")
+            lines.append(f"✅ Valid {label} '{value}' passed")
     
-    # Invalid platforms
-    invalid_platforms = [
-        "",  # Empty
-        "Unknown",
-        "DCS World",
-        "BMS Falcon"
-    ]
-    
-    for platform in invalid_platforms:
-        is_valid, error = validate_platform(platform)
+    for value in invalid_cases:
+        is_valid, error = validator(value)
         if is_valid:
-            print(f"❌ Invalid platform '{platform}' should have failed")
+            failures.append(value)
+            lines.append(f"❌ Invalid {label} '{value}' should have failed")
         else:
-            print(f"✅ Invalid platform '{platform}' correctly rejected: {error}")
+            lines.append(f"✅ Invalid {label} '{value}' correctly rejected: {error}")
+    
+    print("\n".join(lines))
+    return failures
+
+@pytest.mark.parametrize("label,validator,valid_cases,invalid_cases", VALIDATOR_CASES,
+                         ids=[case[0] for case in VALIDATOR_CASES])
+def test_validator_cases(label, validator, valid_cases, invalid_cases):
+    """Test a single-argument validator against its case table"""
+    assert check_validator_cases(label, validator, valid_cases, invalid_cases) == []
 
 def test_numeric_validation():
     """Test numeric value validation"""
-    print("\nTesting numeric validation...")
+    lines = ["\nTesting numeric validation..."]
     
     # Valid numbers
     test_cases = [
@@ -202,9 +149,9 @@ def test_numeric_validation():
     for value, name, min_val, max_val in test_cases:
         is_valid, error = validate_numeric_value(value, name, min_val, max_val)
         if not is_valid:
-            print(f"❌ Valid number {value} failed: {error}")
+            lines.append(f"❌ Valid number {value} failed: {error}")
         else:
-            print(f"✅ Valid number {value} passed")
+            lines.append(f"✅ Valid number {value} passed")
     
     # Invalid numbers
     invalid_cases = [
@@ -217,66 +164,36 @@ def test_numeric_validation():
     for value, name, min_val, max_val in invalid_cases:
         is_valid, error = validate_numeric_value(value, name, min_val, max_val)
         if is_valid:
-            print(f"❌ Invalid number {value} should have failed")
+            lines.append(f"❌ Invalid number {value} should have failed")
         else:
-            print(f"✅ Invalid number {value} correctly rejected: {error}")
-
-def test_callsigns_list_validation():
-    """Test callsigns list validation"""
-    print("\nTesting callsigns list validation...")
+            lines.append(f"✅ Invalid number {value} correctly rejected: {error}")
     
-    # Valid lists
-    valid_lists = [
-        ["Alpha", "Bravo", "Charlie"],
-        ["Single"],
-        []
-    ]
-    
-    for callsigns in valid_lists:
-        is_valid, error = validate_callsigns_list(callsigns)
-        if not is_valid:
-            print(f"❌ Valid callsigns list failed: {error}")
-        else:
-            print(f"✅ Valid callsigns list passed")
-    
-    # Invalid lists
-    invalid_lists = [
-        ["A" * 51],  # Too long callsign
-        ["Alpha", ""],  # Empty callsign
-        ["Alpha", "B" * 51],  # One too long
-        ["A"] * 101,  # Too many callsigns
-        "not_a_list",  # Not a list
-    ]
-    
-    for callsigns in invalid_lists:
-        is_valid, error = validate_callsigns_list(callsigns)
-        if is_valid:
-            print(f"❌ Invalid callsigns list should have failed")
-        else:
-            print(f"✅ Invalid callsigns list correctly rejected: {error}")
+    print("\n".join(lines))
 
 def test_sanitize_string():
     """Test string sanitization"""
-    print("\nTesting string sanitization...")
+    lines = ["\nTesting string sanitization..."]
     
     test_cases = [
         ("Normal string", "Normal string"),
         ("String with\nnewline", "String withnewline"),
         ("String with\x00null", "String withnull"),
         ("String with<script>", "String with<script>"),  # Should be handled by validation
-        ("A" * 2000, "A" * 1000),  # Should be truncated
+        (LONG_2000, LONG_1000),  # Should be truncated
     ]
     
     for input_str, expected in test_cases:
         result = sanitize_string(input_str, 1000)
         if result == expected:
-            print(f"✅ Sanitization passed: '{input_str}' -> '{result}'")
+            lines.append(f"✅ Sanitization passed: '{input_str}' -> '{result}'")
         else:
-            print(f"❌ Sanitization failed: '{input_str}' -> '{result}' (expected: '{expected}')")
+            lines.append(f"❌ Sanitization failed: '{input_str}' -> '{result}' (expected: '{expected}')")
+    
+    print("\n".join(lines))
 
 def test_pilot_data_validation():
     """Test pilot data validation"""
-    print("\nTesting pilot data validation...")
+    lines = ["\nTesting pilot data validation..."]
     
     # Valid pilot data
     valid_data = {
@@ -291,14 +208,14 @@ def test_pilot_data_validation():
     
     is_valid, error = validate_pilot_data(valid_data)
     if not is_valid:
-        print(f"❌ Valid pilot data failed: {error}")
+        lines.append(f"❌ Valid pilot data failed: {error}")
     else:
-        print(f"✅ Valid pilot data passed")
+        lines.append(f"✅ Valid pilot data passed")
     
     # Invalid pilot data
     invalid_data = {
         "date": "2024-01-01",
-        "mission": "A" * 201,  # Too long
+        "mission": LONG_201,  # Too long
         "aircraft": "F-16C",
         "platform": "DCS",
         "aa_kills": -1,  # Negative
@@ -306,13 +223,15 @@ def test_pilot_data_validation():
     
     is_valid, error = validate_pilot_data(invalid_data)
     if is_valid:
-        print(f"❌ Invalid pilot data should have failed")
+        lines.append(f"❌ Invalid pilot data should have failed")
     else:
-        print(f"✅ Invalid pilot data correctly rejected: {error}")
+        lines.append(f"✅ Invalid pilot data correctly rejected: {error}")
+    
+    print("\n".join(lines))
 
 def test_discord_data_validation():
     """Test Discord data validation"""
-    print("\nTesting Discord data validation...")
+    lines = ["\nTesting Discord data validation..."]
     
     # Valid Discord data
     valid_data = {
@@ -327,9 +246,9 @@ def test_discord_data_validation():
     
     is_valid, error = validate_discord_data(valid_data)
     if not is_valid:
-        print(f"❌ Valid Discord data failed: {error}")
+        lines.append(f"❌ Valid Discord data failed: {error}")
     else:
-        print(f"✅ Valid Discord data passed")
+        lines.append(f"✅ Valid Discord data passed")
     
     # Invalid Discord data
     invalid_data = {
@@ -339,13 +258,46 @@ def test_discord_data_validation():
     
     is_valid, error = validate_discord_data(invalid_data)
     if is_valid:
-        print(f"❌ Invalid Discord data should have failed")
+        lines.append(f"❌ Invalid Discord data should have failed")
     else:
-        print(f"✅ Invalid Discord data correctly rejected: {error}")
+        lines.append(f"✅ Invalid Discord data correctly rejected: {error}")
+    
+    print("\n".join(lines))
+
+@pytest.mark.parametrize("field", ["pilotName", "pilotCallsign", "aircraftType", "missionName"])
+def test_discord_data_rejects_non_string_field(field):
+    """Non-string JSON values are rejected, not passed to the memoized validators"""
+    data = {"pilotName": "Test Pilot", field: ["Alpha"]}
+    is_valid, error = validate_discord_data(data)
+    assert not is_valid
+    assert error.startswith(f"{field}: ") and error.endswith("must be a string")
+
+class UnderDeclaredUpload:
+    """Upload whose part Content-Length claims fewer bytes than the stream holds"""
+    
+    filename = 'mission.xml'
+    content_length = 10
+    
+    def __init__(self, size):
+        self.size = size
+        self._pos = 0
+    
+    def seek(self, offset, whence=0):
+        self._pos = self.size + offset if whence == os.SEEK_END else offset
+    
+    def tell(self):
+        return self._pos
 
-def create_test_xml_file():
-    """Create a test XML file for validation"""
-    xml_content = """<?xml version="1.0" encoding="UTF-8"?>
+def test_upload_size_ignores_under_declared_length():
+    """The measured stream size wins over a smaller client-declared Content-Length"""
+    upload = UnderDeclaredUpload(MAX_FILE_SIZE + 1)
+    assert get_upload_size(upload) == MAX_FILE_SIZE + 1
+    
+    is_valid, error = validate_file_upload(upload)
+    assert not is_valid and "too large" in error
+
+# Minimal Tacview document, validated straight from memory
+TEST_XML_CONTENT = b"""<?xml version="1.0" encoding="UTF-8"?>
 <Tacview generator="DCS World">
     <Events>
         <Event>
@@ -370,50 +322,49 @@ def create_test_xml_file():
         </Event>
     </Events>
 </Tacview>"""
-    
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.xml', delete=False) as f:
-        f.write(xml_content)
-        return f.name
 
 def test_xml_content_validation():
     """Test XML content validation"""
-    print("\nTesting XML content validation...")
+    lines = ["\nTesting XML content validation..."]
     
-    # Create test XML file
-    xml_file = create_test_xml_file()
+    is_valid, error = validate_xml_content(TEST_XML_CONTENT)
+    if not is_valid:
+        lines.append(f"❌ Valid XML content failed: {error}")
+    else:
+        lines.append(f"✅ Valid XML content passed")
     
-    try:
-        is_valid, error = validate_xml_content(xml_file)
-        if not is_valid:
-            print(f"❌ Valid XML content failed: {error}")
-        else:
-            print(f"✅ Valid XML content passed")
-        
-        # Test with non-existent file
-        is_valid, error = validate_xml_content("nonexistent.xml")
-        if is_valid:
-            print(f"❌ Non-existent file should have failed")
-        else:
-            print(f"✅ Non-existent file correctly rejected: {error}")
-            
-    finally:
-        # Clean up
-        try:
-            os.unlink(xml_file)
-        except:
-            pass
+    # Test with non-existent file
+    is_valid, error = validate_xml_content("nonexistent.xml")
+    if is_valid:
+        lines.append(f"❌ Non-existent file should have failed")
+    else:
+        lines.append(f"✅ Non-existent file correctly rejected: {error}")
+    
+    print("\n".join(lines))
+
+# Exports whose Tacview root sits past XML_SNIFF_BYTES, behind a BOM and/or a comment
+LONG_COMMENT = b"<!-- " + b"x" * XML_SNIFF_BYTES + b" -->\n"
+TACVIEW_BODY = TEST_XML_CONTENT.split(b"\n", 1)[1]
+PREFIXED_XML_CASES = {
+    "long comment": LONG_COMMENT + TACVIEW_BODY,
+    "bom and long comment": codecs.BOM_UTF8 + LONG_COMMENT + TACVIEW_BODY,
+    "whitespace and long comment": b"\n  " + LONG_COMMENT + TACVIEW_BODY,
+}
+
+@pytest.mark.parametrize("content", PREFIXED_XML_CASES.values(), ids=PREFIXED_XML_CASES.keys())
+def test_xml_content_accepts_prefixed_document(content):
+    assert validate_xml_content(content) == (True, None)
+
+def test_xml_content_rejects_non_xml():
+    assert validate_xml_content(b"PK\x03\x04 not xml") == (False, "Invalid XML format: not an XML document")
 
 def main():
     """Run all validation tests"""
-    print("🧪 Running validation tests...\n")
+    print("🧪 Running validation tests...")
     
-    test_pilot_name_validation()
-    test_callsign_validation()
-    test_mission_name_validation()
-    test_aircraft_validation()
-    test_platform_validation()
+    for case in VALIDATOR_CASES:
+        check_validator_cases(*case)
     test_numeric_validation()
-    test_callsigns_list_validation()
     test_sanitize_string()
     test_pilot_data_validation()
     test_discord_data_validation()
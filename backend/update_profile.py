@@ -1,32 +1,61 @@
-import json
 from pathlib import Path
+from error_handling import _loads, _dumps, safe_file_replace
 import logging
 logger = logging.getLogger(__name__)
 
 PROFILE_DIR = Path("profiles")
 
-def load_profile(callsign):
-    path = PROFILE_DIR / f"{callsign.lower()}.json"
+# Lowercased callsign -> profile path, so repeat lookups skip building a new Path
+_path_cache = {}
+
+def profile_path(callsign):
+    key = callsign.lower()
+    path = _path_cache.get(key)
+    if path is None:
+        path = _path_cache[key] = PROFILE_DIR / f"{key}.json"
+    return path
+
+def load_profile(callsign, path=None):
+    if path is None:
+        path = profile_path(callsign)
     if not path.exists():
         return {"callsign": callsign, "mission_summary": {}, "missions": []}
-    with open(path, 'r') as f:
-        return json.load(f)
+    return _loads(path.read_bytes())
+
+def save_profile(callsign, data, path=None):
+    if path is None:
+        path = profile_path(callsign)
+    # Same atomic replace as profile_manager.save_profile
+    safe_file_replace(path, _dumps(data))
 
-def save_profile(callsign, data):
-    path = PROFILE_DIR / f"{callsign.lower()}.json"
-    with open(path, 'w') as f:
-        json.dump(data, f, indent=2)
+# Running mission_summary totals and the mission field each one accumulates
+SUMMARY_FIELDS = {
+    "total_aa_kills": "aa_kills",
+    "total_ag_kills": "ag_kills",
+    "total_minutes": "flight_minutes",
+}
+
+def add_to_summary(summary, mission_data):
+    """Fold one mission into the running summary totals"""
+    summary["total_flights"] = summary.get("total_flights", 0) + 1
+    for total, field in SUMMARY_FIELDS.items():
+        summary[total] = summary.get(total, 0) + mission_data.get(field, 0)
 
 def update_with_mission(callsign, mission_data):
-    profile = load_profile(callsign)
+    path = profile_path(callsign)
+    profile = load_profile(callsign, path)
+    if profile["missions"] and "total_flights" not in profile.get("mission_summary", {}):
+        # Saved before running totals were kept: rebuild from the history first
+        recalculate_summary(profile)
     profile["missions"].append(mission_data)
-    # TODO: recalculate summary
-    save_profile(callsign, profile)
-
-# TODO: recalculate summary
-# Add a placeholder function
+    # Add just this mission's delta rather than rescanning the whole history
+    add_to_summary(profile["mission_summary"], mission_data)
+    save_profile(callsign, profile, path)
 
 def recalculate_summary(profile):
-    logger.info("Recalculate summary called, but not yet implemented.")
-    # Placeholder for summary recalculation logic
-    pass
+    """Rebuild mission_summary from the full mission history (e.g. after hand edits)"""
+    summary = {}
+    for mission_data in profile["missions"]:
+        add_to_summary(summary, mission_data)
+    profile["mission_summary"] = summary
+    return summary
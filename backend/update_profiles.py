@@ -1,7 +1,7 @@
-import argparse
+import os
 from pathlib import Path
 from xml_parser import parse_tacview_xml
-from profile_manager import load_profile, save_profile, update_profile
+from profile_manager import load_profile, save_profile, update_profile, profile_path
 import logging
 logger = logging.getLogger(__name__)
 
@@ -9,15 +9,31 @@ def is_player_client(pilot_name: str, aircraft_name: str, group: str = "") -> bo
     logger.info(f"FILTER CHECK: {pilot_name}")
     # ... rest of function ...
 
+def _update_one(nickname, mission_data, flight_minutes, profile_dir, existing):
+    """Load, update and save one pilot's profile."""
+    aircraft = mission_data.get("aircraft", "Unknown")
+    # Build the path once and reuse it for the load and the save
+    path = profile_path(nickname, profile_dir)
+    # Compare case-insensitively: on Windows "Six.json" and "six.json" are the same
+    # file, and a false positive elsewhere just falls back to a fresh profile
+    profile = load_profile(nickname, profile_dir, path, exists=path.name.lower() in existing)
+    update_profile(profile, mission_data, flight_minutes, aircraft)
+    save_profile(nickname, profile, profile_dir, path)
+
+def _apply_missions(pilot_missions, profile_dir, flight_minutes_for):
+    """Fold each pilot's mission into their profile, reading and writing each file once."""
+    # One directory listing instead of a stat per pilot
+    with os.scandir(profile_dir) as entries:
+        existing = frozenset(entry.name.lower() for entry in entries)
+
+    for nickname, mission_data in pilot_missions.items():
+        _update_one(nickname, mission_data, flight_minutes_for(mission_data), profile_dir, existing)
+
 def update_profiles_from_xml(xml_path, profile_dir):
     pilot_missions = parse_tacview_xml(xml_path)
     profile_dir.mkdir(exist_ok=True)
 
-    for nickname, mission_data in pilot_missions.items():
-        aircraft = mission_data.get("aircraft", "Unknown")
-        profile = load_profile(nickname, profile_dir)
-        update_profile(profile, mission_data, flight_minutes=45, aircraft=aircraft)
-        save_profile(nickname, profile, profile_dir)
+    _apply_missions(pilot_missions, profile_dir, lambda mission_data: 45)
 
 def update_profiles_from_data(pilot_data, profile_dir=None):
     """Update pilot profiles using parsed pilot data."""
@@ -26,14 +42,9 @@ def update_profiles_from_data(pilot_data, profile_dir=None):
     
     profile_dir.mkdir(exist_ok=True)
 
-    for nickname, mission_data in pilot_data.items():
-        aircraft = mission_data.get("aircraft", "Unknown")
-        profile = load_profile(nickname, profile_dir)
-        
-        # Use flight_minutes instead of flight_hours
-        flight_minutes = mission_data.get("flight_minutes", 0)
-        update_profile(profile, mission_data, flight_minutes, aircraft)
-        save_profile(nickname, profile, profile_dir)
+    # Use flight_minutes instead of flight_hours
+    _apply_missions(pilot_data, profile_dir,
+                    lambda mission_data: mission_data.get("flight_minutes", 0))
 
 def update_profiles(xml_path):
     """Update pilot profiles using data from the provided Tacview XML file."""
@@ -42,6 +53,10 @@ def update_profiles(xml_path):
     update_profiles_from_xml(xml_path, out_dir)
 
 if __name__ == "__main__":
+    # Imported here so app.py and the bots, which import this module, skip argparse;
+    # the CLI itself runs once per upload, so a full parser is worth keeping for its --help
+    import argparse
+
     parser = argparse.ArgumentParser(description="Update pilot profiles from Tacview XML")
     parser.add_argument("--xml", required=True, help="Path to Tacview XML file")
     parser.add_argument("--out", default="pilot_profiles", help="Output directory for pilot profiles")
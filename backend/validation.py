@@ -1,6 +1,16 @@
 import re
+import io
+import codecs
 import os
-import xml.etree.ElementTree as ET
+import string
+import functools
+try:
+    from lxml import etree as ET
+    # Same hardening as xml_parser: no entity expansion, no network, default size limits
+    ITERPARSE_OPTIONS = {"huge_tree": False, "resolve_entities": False, "no_network": True}
+except ImportError:
+    import xml.etree.ElementTree as ET
+    ITERPARSE_OPTIONS = {}
 from typing import Dict, List, Optional, Tuple, Union
 from werkzeug.datastructures import FileStorage
 import logging
@@ -16,12 +26,20 @@ MAX_MISSION_NAME_LENGTH = 200
 MAX_AIRCRAFT_NAME_LENGTH = 100
 MAX_NOTE_LENGTH = 1000
 MAX_CALLSIGNS_COUNT = 100
+MAX_XML_EVENTS = 100000  # Reasonable limit
+EVENTS_TO_VALIDATE = 100
+
+# Leading bytes sniffed to reject obvious non-XML before parsing
+XML_SNIFF_BYTES = 256
+
+# Entries kept per memoized single-string validator
+VALIDATION_CACHE_SIZE = 2048
 
 # Allowed file extensions
-ALLOWED_EXTENSIONS = {'.xml'}
+ALLOWED_EXTENSIONS = frozenset({'.xml'})
 
 # Valid aircraft types (whitelist for security)
-VALID_AIRCRAFT_TYPES = {
+VALID_AIRCRAFT_TYPES = frozenset({
     'F-16C', 'F-15E', 'F-15C', 'F/A-18C', 'AV-8B', 'A-10C', 'A-10A',
     'P-51D', 'MiG-21', 'MiG-29', 'Su-27', 'Su-33', 'Su-25', 'F-5E',
     'F-86F', 'MiG-15', 'Fw 190', 'Bf 109', 'Spitfire', 'Mosquito',
@@ -33,16 +51,33 @@ VALID_AIRCRAFT_TYPES = {
     'Havoc', 'Chinook', 'Black Hawk', 'Super Cobra', 'Viper', 'Venom',
     'Halo', 'Helix', 'Little Bird', 'Cayuse', 'Twin Huey', 'Super Stallion',
     'Sea Knight', 'Osprey'
-}
+})
 
 # Valid platforms
-VALID_PLATFORMS = {'DCS', 'BMS', 'IL2'}
+VALID_PLATFORMS = frozenset({'DCS', 'BMS', 'IL2'})
+
+# Valid Tacview event actions
+VALID_ACTIONS = frozenset({
+    "HasBeenDestroyed", "HasLanded", "HasTakenOff", "HasEjected",
+    "HasBeenRescued", "HasCrashed", "HasDespawned"
+})
+
+# Regex patterns for validation (used with fullmatch, so no anchors)
+MISSION_NAME_PATTERN = re.compile(r'[a-zA-Z0-9\s\-_\.]+')
+AIRCRAFT_PATTERN = re.compile(r'[a-zA-Z0-9\s\-_\.\/]+')
+FILENAME_PATTERN = re.compile(r'[a-zA-Z0-9\s\-_\.]+')
+
+# Control characters stripped by sanitize_string: everything below 0x20 except tab, plus DEL
+CONTROL_CHARS_TABLE = dict.fromkeys([c for c in range(0x20) if c != 0x09] + [0x7F])
 
-# Regex patterns for validation
-PILOT_NAME_PATTERN = re.compile(r'^[a-zA-Z0-9\s\-_|\.]+$')
-CALLSIGN_PATTERN = re.compile(r'^[a-zA-Z0-9\s\-_|\.]+$')
-MISSION_NAME_PATTERN = re.compile(r'^[a-zA-Z0-9\s\-_\.]+$')
-AIRCRAFT_PATTERN = re.compile(r'^[a-zA-Z0-9\s\-_\.\/]+$')
+# Pilot names and callsigns allow letters, digits, whitespace and - _ | .
+# Translating with this table deletes every allowed non-space character, so
+# anything left over other than whitespace is invalid.
+NAME_CHARS_TABLE = str.maketrans('', '', string.ascii_letters + string.digits + '-_|.')
+
+def _has_only_name_chars(value: str) -> bool:
+    residue = value.translate(NAME_CHARS_TABLE)
+    return not residue or residue.isspace()
 
 class ValidationError(Exception):
     """Custom exception for validation errors"""
@@ -51,6 +86,33 @@ class ValidationError(Exception):
         self.field = field
         super().__init__(self.message)
 
+def looks_like_xml(head: bytes) -> bool:
+    """
+    Cheap check on the first XML_SNIFF_BYTES of a file, run before parsing it
+    
+    Only obvious non-XML is rejected: after an optional byte order mark and
+    leading whitespace the first byte must be '<'. Declarations, comments and
+    long preambles are left to the parser.
+    """
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return True
+    if head.startswith(codecs.BOM_UTF8):
+        head = head[len(codecs.BOM_UTF8):]
+    head = head.lstrip()
+    return not head or head.startswith(b'<')
+
+def get_upload_size(file) -> int:
+    """
+    Size of an uploaded file in bytes
+    
+    The stream is always measured. A declared part Content-Length is client
+    input, so it can only raise the size, never lower it.
+    """
+    file.seek(0, os.SEEK_END)
+    size = file.tell()
+    file.seek(0)  # Reset file pointer
+    return max(size, getattr(file, 'content_length', None) or 0)
+
 def validate_file_upload(file: FileStorage) -> Tuple[bool, Optional[str]]:
     """
     Validate uploaded file for security and format requirements
@@ -71,72 +133,97 @@ def validate_file_upload(file: FileStorage) -> Tuple[bool, Optional[str]]:
             return False, f"Filename too long (max {MAX_FILENAME_LENGTH} characters)"
         
         # Validate file extension
-        file_ext = os.path.splitext(file.filename.lower())[1]
+        stem, dot, ext = file.filename.rpartition('.')
+        file_ext = f".{ext.lower()}" if stem and dot else ""
         if file_ext not in ALLOWED_EXTENSIONS:
             return False, f"Invalid file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
         
-        # Validate file size
-        file.seek(0, os.SEEK_END)
-        file_size = file.tell()
-        file.seek(0)  # Reset file pointer
+        # Validate filename characters (basic security), before touching the stream
+        if not FILENAME_PATTERN.fullmatch(file.filename):
+            return False, "Filename contains invalid characters"
         
-        if file_size > MAX_FILE_SIZE:
+        # Validate file size
+        if get_upload_size(file) > MAX_FILE_SIZE:
             return False, f"File too large (max {MAX_FILE_SIZE // (1024*1024)}MB)"
         
-        # Validate filename characters (basic security)
-        if not re.match(r'^[a-zA-Z0-9\s\-_\.]+$', file.filename):
-            return False, "Filename contains invalid characters"
-        
         return True, None
         
     except Exception as e:
         logger.error(f"File validation error: {e}")
         return False, "File validation failed"
 
-def validate_xml_content(file_path: str) -> Tuple[bool, Optional[str]]:
+def validate_xml_content(source: Union[str, bytes]) -> Tuple[bool, Optional[str]]:
     """
     Validate XML file content structure and security
     
     Args:
-        file_path: Path to the XML file
+        source: Path to the XML file, or the XML document itself as bytes
         
     Returns:
         Tuple of (is_valid, error_message)
     """
     try:
-        # Check if file exists and is readable
-        if not os.path.exists(file_path):
-            return False, "File not found"
-        
-        if not os.access(file_path, os.R_OK):
-            return False, "File not readable"
+        if isinstance(source, (bytes, bytearray)):
+            xml_stream = io.BytesIO(source)
+        else:
+            # Check if file exists and is readable
+            if not os.path.exists(source):
+                return False, "File not found"
+            
+            if not os.access(source, os.R_OK):
+                return False, "File not readable"
+            
+            xml_stream = open(source, 'rb')
+        
+        # Stream the XML so a large Tacview export never has to sit in memory as one tree
+        root = None
+        events = None
+        in_events = False
+        depth = 0
+        event_count = 0
         
-        # Try to parse XML
         try:
-            tree = ET.parse(file_path)
-            root = tree.getroot()
+            with xml_stream:
+                # Reject obvious non-XML uploads without starting the parser
+                if not looks_like_xml(xml_stream.read(XML_SNIFF_BYTES)):
+                    return False, "Invalid XML format: not an XML document"
+                xml_stream.seek(0)
+                
+                for action, elem in ET.iterparse(xml_stream, events=("start", "end"), **ITERPARSE_OPTIONS):
+                    if action == "start":
+                        depth += 1
+                        if root is None:
+                            # Validate root element
+                            root = elem
+                            if root.tag != "Tacview":
+                                return False, "Invalid XML: Root element must be 'Tacview'"
+                        elif events is None and depth == 2 and elem.tag == "Events":
+                            events = elem
+                            in_events = True
+                        continue
+                    
+                    if in_events and depth == 3 and elem.tag == "Event":
+                        # Check for reasonable number of events (prevent DoS)
+                        event_count += 1
+                        if event_count > MAX_XML_EVENTS:
+                            return False, "XML contains too many events (potential DoS)"
+                        
+                        # Validate event structure of the first events only
+                        if event_count <= EVENTS_TO_VALIDATE and not validate_event_structure(elem):
+                            return False, f"Invalid event structure at index {event_count - 1}"
+                        
+                        # Drop the finished event so memory stays flat
+                        events.remove(elem)
+                    elif elem is events:
+                        in_events = False
+                    depth -= 1
         except ET.ParseError as e:
             return False, f"Invalid XML format: {str(e)}"
         
-        # Validate root element
-        if root.tag != "Tacview":
-            return False, "Invalid XML: Root element must be 'Tacview'"
-        
         # Check for required elements
-        events = root.find("Events")
         if events is None:
             return False, "Invalid XML: Missing 'Events' section"
         
-        # Check for reasonable number of events (prevent DoS)
-        event_count = len(events.findall("Event"))
-        if event_count > 100000:  # Reasonable limit
-            return False, "XML contains too many events (potential DoS)"
-        
-        # Validate event structure
-        for i, event in enumerate(events.findall("Event")[:100]):  # Check first 100 events
-            if not validate_event_structure(event):
-                return False, f"Invalid event structure at index {i}"
-        
         return True, None
         
     except Exception as e:
@@ -152,11 +239,7 @@ def validate_event_structure(event) -> bool:
             return False
         
         # Validate action values
-        valid_actions = {
-            "HasBeenDestroyed", "HasLanded", "HasTakenOff", "HasEjected",
-            "HasBeenRescued", "HasCrashed", "HasDespawned"
-        }
-        if action not in valid_actions:
+        if action not in VALID_ACTIONS:
             return False
         
         # Check for at least one object
@@ -182,10 +265,18 @@ def validate_pilot_name(name: str) -> Tuple[bool, Optional[str]]:
     if not name:
         return False, "Pilot name is required"
     
+    if not isinstance(name, str):
+        return False, "Pilot name must be a string"
+    
+    return _validate_pilot_name(name)
+
+@functools.lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _validate_pilot_name(name: str) -> Tuple[bool, Optional[str]]:
+    """Checks for a non-empty pilot name string, memoized per value"""
     if len(name) > MAX_PILOT_NAME_LENGTH:
         return False, f"Pilot name too long (max {MAX_PILOT_NAME_LENGTH} characters)"
     
-    if not PILOT_NAME_PATTERN.match(name):
+    if not _has_only_name_chars(name):
         return False, "Pilot name contains invalid characters"
     
     return True, None
@@ -203,10 +294,18 @@ def validate_callsign(callsign: str) -> Tuple[bool, Optional[str]]:
     if not callsign:
         return False, "Callsign is required"
     
+    if not isinstance(callsign, str):
+        return False, "Callsign must be a string"
+    
+    return _validate_callsign(callsign)
+
+@functools.lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _validate_callsign(callsign: str) -> Tuple[bool, Optional[str]]:
+    """Checks for a non-empty callsign string, memoized per value"""
     if len(callsign) > MAX_CALLSIGN_LENGTH:
         return False, f"Callsign too long (max {MAX_CALLSIGN_LENGTH} characters)"
     
-    if not CALLSIGN_PATTERN.match(callsign):
+    if not _has_only_name_chars(callsign):
         return False, "Callsign contains invalid characters"
     
     return True, None
@@ -224,10 +323,18 @@ def validate_mission_name(name: str) -> Tuple[bool, Optional[str]]:
     if not name:
         return False, "Mission name is required"
     
+    if not isinstance(name, str):
+        return False, "Mission name must be a string"
+    
+    return _validate_mission_name(name)
+
+@functools.lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _validate_mission_name(name: str) -> Tuple[bool, Optional[str]]:
+    """Checks for a non-empty mission name string, memoized per value"""
     if len(name) > MAX_MISSION_NAME_LENGTH:
         return False, f"Mission name too long (max {MAX_MISSION_NAME_LENGTH} characters)"
     
-    if not MISSION_NAME_PATTERN.match(name):
+    if not MISSION_NAME_PATTERN.fullmatch(name):
         return False, "Mission name contains invalid characters"
     
     return True, None
@@ -245,10 +352,18 @@ def validate_aircraft_name(name: str) -> Tuple[bool, Optional[str]]:
     if not name:
         return False, "Aircraft name is required"
     
+    if not isinstance(name, str):
+        return False, "Aircraft name must be a string"
+    
+    return _validate_aircraft_name(name)
+
+@functools.lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _validate_aircraft_name(name: str) -> Tuple[bool, Optional[str]]:
+    """Checks for a non-empty aircraft name string, memoized per value"""
     if len(name) > MAX_AIRCRAFT_NAME_LENGTH:
         return False, f"Aircraft name too long (max {MAX_AIRCRAFT_NAME_LENGTH} characters)"
     
-    if not AIRCRAFT_PATTERN.match(name):
+    if not AIRCRAFT_PATTERN.fullmatch(name):
         return False, "Aircraft name contains invalid characters"
     
     # Check against whitelist for security
@@ -271,6 +386,14 @@ def validate_platform(platform: str) -> Tuple[bool, Optional[str]]:
     if not platform:
         return False, "Platform is required"
     
+    if not isinstance(platform, str):
+        return False, "Platform must be a string"
+    
+    return _validate_platform(platform)
+
+@functools.lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _validate_platform(platform: str) -> Tuple[bool, Optional[str]]:
+    """Checks for a non-empty platform string, memoized per value"""
     if platform not in VALID_PLATFORMS:
         return False, f"Invalid platform. Allowed: {', '.join(VALID_PLATFORMS)}"
     
@@ -324,10 +447,15 @@ def validate_callsigns_list(callsigns: List[str]) -> Tuple[bool, Optional[str]]:
     if len(callsigns) > MAX_CALLSIGNS_COUNT:
         return False, f"Too many callsigns (max {MAX_CALLSIGNS_COUNT})"
     
-    for i, callsign in enumerate(callsigns):
-        is_valid, error = validate_callsign(callsign)
-        if not is_valid:
-            return False, f"Callsign {i+1}: {error}"
+    # Single short-circuiting pass with the validate_callsign checks inlined;
+    # validate_callsign is only called to word the error for a failing entry
+    max_length = MAX_CALLSIGN_LENGTH
+    has_only_name_chars = _has_only_name_chars
+    for i, callsign in enumerate(callsigns, 1):
+        if not isinstance(callsign, str):
+            return False, f"Callsign {i}: Callsign must be a string"
+        if not callsign or len(callsign) > max_length or not has_only_name_chars(callsign):
+            return False, f"Callsign {i}: {validate_callsign(callsign)[1]}"
     
     return True, None
 
@@ -346,13 +474,10 @@ def sanitize_string(value: str, max_length: int = 1000) -> str:
         return ""
     
     # Remove null bytes and control characters (including newlines)
-    sanitized = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F\n\r]', '', str(value))
+    sanitized = str(value).translate(CONTROL_CHARS_TABLE)
     
     # Limit length
-    if len(sanitized) > max_length:
-        sanitized = sanitized[:max_length]
-    
-    return sanitized.strip()
+    return sanitized[:max_length].strip()
 
 def validate_pilot_data(pilot_data: Dict) -> Tuple[bool, Optional[str]]:
     """
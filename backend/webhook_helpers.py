@@ -21,6 +21,40 @@ def format_duration(seconds: int) -> str:
     return f"{seconds}s"
 
 
+# Embed field layouts: (name, data key, default, formatter, inline)
+PILOT_STATS_FIELDS = (
+    ("Total Flights", "totalFlights", 0, str, True),
+    ("Total Flight Time", "totalFlightTime", 0, format_duration, True),
+    ("Avg Flight Duration", "averageFlightDuration", 0, format_duration, True),
+    ("A-A Kills", "totalAaKills", 0, str, True),
+    ("A-G Kills", "totalAgKills", 0, str, True),
+    ("Total Kills", "totalKills", 0, str, True),
+    ("Friendly Kills", "totalFratKills", 0, str, True),
+    ("RTBs", "totalRtbCount", 0, str, True),
+    ("Ejections", "totalEjections", 0, str, True),
+    ("Deaths", "totalDeaths", 0, str, True),
+    ("K/D Ratio", "kdRatio", "N/A", str, True),
+    ("Favorite Aircraft", "favoriteAircraft", "Unknown", str, False),
+)
+
+FLIGHT_SUMMARY_FIELDS = (
+    ("Aircraft", "aircraftType", "Unknown", str, True),
+    ("Mission", "missionName", "Unknown", str, True),
+    ("Duration", "durationSeconds", 0, format_duration, True),
+    ("A-A Kills", "aaKills", 0, str, True),
+    ("A-G Kills", "agKills", 0, str, True),
+    ("Friendly Kills", "fratKills", 0, str, True),
+    ("RTBs", "rtbCount", 0, str, True),
+    ("Ejections", "ejections", 0, str, True),
+    ("Deaths", "deaths", 0, str, True),
+)
+
+
+def add_embed_fields(embed: DiscordEmbed, fields: tuple, data: dict) -> None:
+    for name, key, default, fmt, inline in fields:
+        embed.add_embed_field(name=name, value=fmt(data.get(key, default)), inline=inline)
+
+
 def send_pilot_stats(data: dict) -> dict:
     if not DISCORD_WEBHOOK_URL:
         return {"success": False, "message": "Discord webhook URL not configured"}
@@ -41,18 +75,7 @@ def send_pilot_stats(data: dict) -> dict:
         timestamp=datetime.utcnow()
     )
     embed.add_embed_field(name="Pilot", value=f"{data['pilotName']} ({data.get('pilotCallsign', 'N/A')})", inline=False)
-    embed.add_embed_field(name="Total Flights", value=str(data.get("totalFlights", 0)), inline=True)
-    embed.add_embed_field(name="Total Flight Time", value=format_duration(data.get("totalFlightTime", 0)), inline=True)
-    embed.add_embed_field(name="Avg Flight Duration", value=format_duration(data.get("averageFlightDuration", 0)), inline=True)
-    embed.add_embed_field(name="A-A Kills", value=str(data.get("totalAaKills", 0)), inline=True)
-    embed.add_embed_field(name="A-G Kills", value=str(data.get("totalAgKills", 0)), inline=True)
-    embed.add_embed_field(name="Total Kills", value=str(total_kills), inline=True)
-    embed.add_embed_field(name="Friendly Kills", value=str(data.get("totalFratKills", 0)), inline=True)
-    embed.add_embed_field(name="RTBs", value=str(data.get("totalRtbCount", 0)), inline=True)
-    embed.add_embed_field(name="Ejections", value=str(data.get("totalEjections", 0)), inline=True)
-    embed.add_embed_field(name="Deaths", value=str(deaths), inline=True)
-    embed.add_embed_field(name="K/D Ratio", value=kd_ratio, inline=True)
-    embed.add_embed_field(name="Favorite Aircraft", value=data.get("favoriteAircraft", "Unknown"), inline=False)
+    add_embed_fields(embed, PILOT_STATS_FIELDS, dict(data, totalKills=total_kills, kdRatio=kd_ratio))
     embed.set_footer(text="DCS Pilot Logbook")
 
     webhook.add_embed(embed)
@@ -74,9 +97,13 @@ def send_flight_summary(data: dict) -> dict:
     timestamp_value = data.get("startTime")
     if isinstance(timestamp_value, str):
         try:
-            timestamp_value = parse_dt(timestamp_value)
-        except Exception:
-            timestamp_value = datetime.utcnow()
+            # The frontend sends ISO-8601; dateutil only handles anything else
+            timestamp_value = datetime.fromisoformat(timestamp_value.replace("Z", "+00:00"))
+        except ValueError:
+            try:
+                timestamp_value = parse_dt(timestamp_value)
+            except Exception:
+                timestamp_value = datetime.utcnow()
     elif not isinstance(timestamp_value, datetime):
         timestamp_value = datetime.utcnow()
 
@@ -88,15 +115,7 @@ def send_flight_summary(data: dict) -> dict:
         timestamp=timestamp_value
     )
     embed.add_embed_field(name="Pilot", value=f"{data['pilotName']} ({data.get('pilotCallsign', 'N/A')})", inline=True)
-    embed.add_embed_field(name="Aircraft", value=data.get("aircraftType", "Unknown"), inline=True)
-    embed.add_embed_field(name="Mission", value=data.get("missionName", "Unknown"), inline=True)
-    embed.add_embed_field(name="Duration", value=format_duration(data.get("durationSeconds", 0)), inline=True)
-    embed.add_embed_field(name="A-A Kills", value=str(data.get("aaKills", 0)), inline=True)
-    embed.add_embed_field(name="A-G Kills", value=str(data.get("agKills", 0)), inline=True)
-    embed.add_embed_field(name="Friendly Kills", value=str(data.get("fratKills", 0)), inline=True)
-    embed.add_embed_field(name="RTBs", value=str(data.get("rtbCount", 0)), inline=True)
-    embed.add_embed_field(name="Ejections", value=str(data.get("ejections", 0)), inline=True)
-    embed.add_embed_field(name="Deaths", value=str(data.get("deaths", 0)), inline=True)
+    add_embed_fields(embed, FLIGHT_SUMMARY_FIELDS, data)
     embed.set_footer(text="DCS Pilot Logbook")
 
     webhook.add_embed(embed)
@@ -1,30 +1,65 @@
-import xml.etree.ElementTree as ET
+try:
+    # libxml2-backed parser, several times faster than the stdlib one on large Tacview files
+    from lxml import etree as ET
+    # No entity expansion, no network access and libxml2's default size limits
+    ITERPARSE_OPTIONS = {"huge_tree": False, "resolve_entities": False, "no_network": True}
+except ImportError:
+    import xml.etree.ElementTree as ET
+    ITERPARSE_OPTIONS = {}
 from collections import defaultdict
+from array import array
+from itertools import islice
+from heapq import nsmallest
 from pathlib import Path
 from datetime import datetime
 from nickname_matcher import resolve_fuzzy_nickname
+import functools
 import math
 import re
 import json
 import os
+import sys
 from validation import (
     validate_pilot_name, validate_mission_name, validate_aircraft_name,
-    validate_platform, validate_numeric_value, sanitize_string
+    validate_platform, validate_numeric_value, sanitize_string,
+    validate_event_structure, looks_like_xml, MAX_XML_EVENTS, EVENTS_TO_VALIDATE,
+    XML_SNIFF_BYTES
 )
 from error_handling import (
     APIError, ErrorCodes, log_operation_start, log_operation_success,
-    log_operation_failure, safe_json_save, safe_json_read
+    log_operation_failure, safe_json_save, safe_json_read, _loads
 )
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Per-pilot counter bumped by each simple event action
+ACTION_COUNTERS = {
+    "HasLanded": "rtb",
+    "HasEjected": "ejections",
+}
+
+# Config files kept next to this module
+CONFIG_DIR = os.path.join(os.path.dirname(__file__), 'config')
+SQUADRON_CALLSIGNS_FILE = os.path.join(CONFIG_DIR, 'squadron_callsigns.json')
+PROCESSED_MISSIONS_FILE = os.path.join(CONFIG_DIR, 'processed_missions.json')
+
+# Stationary detection: movement under 100 m between samples, compared as
+# squared degrees so the per-sample check needs no sqrt
+METERS_PER_DEGREE = 111000
+STATIONARY_DEG2 = (100 / METERS_PER_DEGREE) ** 2
+
+# Ground target types (could be moved to config)
+GROUND_TYPES = frozenset({
+    "Infantry", "SAM/AAA", "Vehicle", "Tank", "Artillery", 
+    "Ship", "Boat", "Structure", "Ground"  # Added more common types
+})
+
 # Load player profiles for AI filtering
 def load_player_profiles():
     """Load the player profiles from config/profiles.json"""
     try:
-        with open('config/profiles.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = _loads(Path('config/profiles.json').read_bytes())
         return data.get('players', [])
     except (FileNotFoundError, json.JSONDecodeError, Exception) as e:
         logger.warning(f"profiles.json not found or invalid, using empty player list: {e}")
@@ -40,29 +75,35 @@ def get_player_profiles():
         _PLAYER_PROFILES = load_player_profiles()
     return _PLAYER_PROFILES
 
+# Lowercased callsigns and aliases from the cached profiles
+_KNOWN_NAMES = None
+
+def get_known_names() -> frozenset:
+    """Get the cached set of lowercased known player names"""
+    global _KNOWN_NAMES
+    if _KNOWN_NAMES is None:
+        names = set()
+        for profile in get_player_profiles():
+            callsign = profile.get('callsign', '')
+            if callsign:
+                names.add(callsign.lower())
+            names.update(alias.lower() for alias in profile.get('aliases', []) if alias)
+        _KNOWN_NAMES = frozenset(names)
+    return _KNOWN_NAMES
+
 def is_known_player(pilot_name: str) -> bool:
     """Check if a pilot name matches any known player in profiles.json"""
     if not pilot_name:
         return False
     
-    pilot_lower = pilot_name.lower()
-    profiles = get_player_profiles()
-    
-    for profile in profiles:
-        # Check callsign
-        if profile.get('callsign', '').lower() == pilot_lower:
-            return True
-        
-        # Check aliases
-        aliases = profile.get('aliases', [])
-        for alias in aliases:
-            if alias.lower() == pilot_lower:
-                return True
-    
-    return False
+    return pilot_name.lower() in get_known_names()
 
-def parse_xml(filepath: str) -> dict:
-    """Main entry point for XML parsing - returns success/error status"""
+def parse_xml(filepath: str, validate: bool = False) -> dict:
+    """Main entry point for XML parsing - returns success/error status
+    
+    With validate=True the structural checks of validate_xml_content run during
+    the same pass over the file, raising XML_INVALID_STRUCTURE on failure.
+    """
     operation = "xml_parse"
     
     try:
@@ -85,7 +126,7 @@ def parse_xml(filepath: str) -> dict:
             )
         
         # Parse the Tacview XML
-        pilot_data = parse_tacview_xml(filepath)
+        pilot_data = parse_tacview_xml(filepath, validate=validate)
         
         # Check if this was a duplicate mission
         if pilot_data and pilot_data.get("duplicate"):
@@ -138,65 +179,200 @@ def parse_xml(filepath: str) -> dict:
             status_code=500
         )
 
-def parse_tacview_xml(xml_path: str) -> dict:
-    """Parse Tacview XML and extract pilot mission data"""
+def new_pilot_missions(mission_name: str, mission_date: str, flight_minutes, platform: str) -> defaultdict:
+    """Per-pilot mission data, created on first sight of each pilot"""
+    template = {
+        "date": mission_date,
+        "mission": mission_name,
+        "flight_minutes": flight_minutes,  # Mission length in minutes until actual flight time is known
+        "aa_kills": 0,
+        "ag_kills": 0, 
+        "frat_kills": 0, 
+        "rtb": 0,
+        "res": 0,  # Rescued
+        "mia": 0,  # Missing in action 
+        "kia": 0,  # Killed in action
+        "ctd": 0,  # Crash to desktop
+        "platform": platform,  # DCS vs BMS vs IL2 detection
+        "aircraft": "Unknown",
+        "ejections": 0,
+        "deaths": 0,
+        "sorties": 1,  # At least one sortie if they appear in the file
+        "total_kills": 0,
+        "kd_ratio": "N/A",
+        "nicknames": [],  # Track all known nicknames
+        "profile_image": "",  # Profile image path
+        "flight_times": [],  # Track individual flight sessions
+        "stationary_periods": []  # Track stationary periods to filter out
+    }
+    return defaultdict(functools.partial(new_pilot_record, template))
+
+def new_pilot_record(template: dict) -> dict:
+    """Shallow copy of the mission template with fresh per-pilot lists"""
+    record = template.copy()
+    record["nicknames"] = []
+    record["_nickname_set"] = set()  # Membership index for nicknames, dropped in finalize_pilot_data
+    record["flight_times"] = []
+    record["stationary_periods"] = []
+    return record
+
+def invalid_xml(message: str) -> APIError:
+    """Structural validation failure found while parsing"""
+    return APIError(
+        error_code=ErrorCodes.XML_INVALID_STRUCTURE,
+        message=message,
+        status_code=400
+    )
+
+def parse_tacview_xml(xml_path: str, validate: bool = False) -> dict:
+    """Parse Tacview XML and extract pilot mission data
+    
+    The file is streamed rather than loaded as one tree. Mission metadata is
+    read from the elements ahead of <Events>, which is where Tacview writes it,
+    and each Event is discarded as soon as it has been processed.
+    
+    With validate=True the checks from validate_xml_content are applied in the
+    same pass and an APIError is raised instead of returning {}.
+    """
     try:
-        tree = ET.parse(xml_path)
-        root = tree.getroot()
+        root = None
+        events = None
+        in_events = False
+        depth = 0
+        pilot_missions = None
+        duplicate = False
         
-        # Extract mission metadata if available
-        mission_name = extract_mission_name(root, xml_path)
-        mission_date = extract_mission_date(root)
-        mission_duration = extract_mission_duration_safe(root)
+        # Track pilot positions and times for stationary detection
+        pilot_positions = defaultdict(new_position_track)
         
-        # Check for duplicate mission processing
-        if is_mission_already_processed(mission_name, mission_date):
-            logger.warning(f"Mission already processed: {mission_name} on {mission_date}")
-            return {"duplicate": True, "mission_name": mission_name, "mission_date": mission_date}
+        # Each distinct pilot string is fuzzy-matched once per file
+        nick_cache = {}
+        
+        # Pilot/aircraft validation and the player check, once per distinct triple
+        client_cache = {}
+        
+        # Squadron roster is read once per file; player checks are memoized
+        # per file because they also depend on profiles.json
+        squadron_callsigns = tuple(load_squadron_callsigns_safe())
+        is_player_client_cached.cache_clear()
+        
+        # Without a <Duration>, the mission length is the span of event times
+        mission_duration = None
+        first_time, last_time = math.inf, -math.inf
+        timed_events = 0
+        
+        event_count = 0
+        player_events = 0
+        filtered_events = 0
+        
+        with open(xml_path, 'rb') as xml_file:
+            if validate:
+                if not looks_like_xml(xml_file.read(XML_SNIFF_BYTES)):
+                    raise invalid_xml("Invalid XML format: not an XML document")
+                xml_file.seek(0)
+            
+            for action, elem in ET.iterparse(xml_file, events=("start", "end"), **ITERPARSE_OPTIONS):
+                if action == "start":
+                    depth += 1
+                    if root is None:
+                        root = elem
+                        if validate and root.tag != "Tacview":
+                            raise invalid_xml("Invalid XML: Root element must be 'Tacview'")
+                    elif events is None and depth == 2 and elem.tag == "Events":
+                        events = elem
+                        in_events = True
+                        
+                        # Extract mission metadata if available
+                        mission_name = extract_mission_name(root, xml_path)
+                        mission_date = extract_mission_date(root)
+                        mission_duration = extract_mission_duration(root)
+                        
+                        # Check for duplicate mission processing. When validating, the rest of
+                        # the document is still checked before the duplicate is reported
+                        if is_mission_already_processed(mission_name, mission_date):
+                            if not validate:
+                                logger.warning(f"Mission already processed: {mission_name} on {mission_date}")
+                                return {"duplicate": True, "mission_name": mission_name, "mission_date": mission_date}
+                            duplicate = True
+                            continue
+                        
+                        # Initialize pilot mission data with enhanced tracking
+                        pilot_missions = new_pilot_missions(
+                            mission_name, mission_date,
+                            int(mission_duration / 60) if mission_duration is not None else None,
+                            detect_platform(root)
+                        )
+                    continue
+                
+                if in_events and depth == 3 and elem.tag == "Event":
+                    if validate:
+                        # Check for reasonable number of events (prevent DoS)
+                        event_count += 1
+                        if event_count > MAX_XML_EVENTS:
+                            raise invalid_xml("XML contains too many events (potential DoS)")
+                        if event_count <= EVENTS_TO_VALIDATE and not validate_event_structure(elem):
+                            raise invalid_xml(f"Invalid event structure at index {event_count - 1}")
+                    
+                    if duplicate:
+                        # Already processed: the event is only validated
+                        events.remove(elem)
+                        depth -= 1
+                        continue
+                    
+                    if mission_duration is None:
+                        time_text = elem.findtext("Time")
+                        if time_text:
+                            try:
+                                time_val = float(time_text)
+                            except ValueError:
+                                time_val = None
+                            if time_val is not None:
+                                timed_events += 1
+                                if time_val < first_time:
+                                    first_time = time_val
+                                if time_val > last_time:
+                                    last_time = time_val
+                    
+                    accepted = process_event(elem, pilot_missions, pilot_positions, nick_cache,
+                                             squadron_callsigns=squadron_callsigns,
+                                             client_cache=client_cache)
+                    if accepted:
+                        player_events += 1
+                    elif accepted is False:
+                        filtered_events += 1
+                    
+                    # Drop the processed event so memory stays flat
+                    events.remove(elem)
+                elif elem is events:
+                    in_events = False
+                depth -= 1
         
-        events = root.find("Events")
         if events is None:
+            if validate:
+                raise invalid_xml("Invalid XML: Missing 'Events' section")
+            # Same order as before: a duplicate is reported ahead of a missing Events section
+            mission_name = extract_mission_name(root, xml_path)
+            mission_date = extract_mission_date(root)
+            if is_mission_already_processed(mission_name, mission_date):
+                logger.warning(f"Mission already processed: {mission_name} on {mission_date}")
+                return {"duplicate": True, "mission_name": mission_name, "mission_date": mission_date}
             logger.warning("Warning: No Events section found in XML")
             return {}
         
-        # Define ground target types (could be moved to config)
-        ground_types = {
-            "Infantry", "SAM/AAA", "Vehicle", "Tank", "Artillery", 
-            "Ship", "Boat", "Structure", "Ground"  # Added more common types
-        }
-        
-        # Initialize pilot mission data with enhanced tracking
-        pilot_missions = defaultdict(lambda: {
-            "date": mission_date,
-            "mission": mission_name,
-            "flight_minutes": int(mission_duration / 60) if mission_duration is not None else 45,  # Convert seconds to minutes, default to 45 if None
-            "aa_kills": 0,
-            "ag_kills": 0, 
-            "frat_kills": 0, 
-            "rtb": 0,
-            "res": 0,  # Rescued
-            "mia": 0,  # Missing in action 
-            "kia": 0,  # Killed in action
-            "ctd": 0,  # Crash to desktop
-            "platform": detect_platform(root),  # DCS vs BMS vs IL2 detection
-            "aircraft": "Unknown",
-            "ejections": 0,
-            "deaths": 0,
-            "sorties": 1,  # At least one sortie if they appear in the file
-            "total_kills": 0,
-            "kd_ratio": "N/A",
-            "nicknames": [],  # Track all known nicknames
-            "profile_image": "",  # Profile image path
-            "flight_times": [],  # Track individual flight sessions
-            "stationary_periods": []  # Track stationary periods to filter out
-        })
+        if duplicate:
+            logger.warning(f"Mission already processed: {mission_name} on {mission_date}")
+            return {"duplicate": True, "mission_name": mission_name, "mission_date": mission_date}
         
-        # Track pilot positions and times for stationary detection
-        pilot_positions = defaultdict(list)
+        if mission_duration is None:
+            # Default duration (45 minutes) unless at least two events carried a time
+            mission_duration = int(last_time - first_time) if timed_events >= 2 else 2700
+            default_minutes = int(mission_duration / 60)
+            for data in pilot_missions.values():
+                if data["flight_minutes"] is None:
+                    data["flight_minutes"] = default_minutes
         
-        # Process all events
-        for event in events.findall("Event"):
-            process_event(event, pilot_missions, ground_types, pilot_positions)
+        # One summary line instead of a log call per event
+        logger.info(f"Player events: {player_events}, filtered out as AI: {filtered_events}")
         
         # Calculate actual flight hours (excluding stationary time)
         calculate_actual_flight_hours(pilot_missions, pilot_positions)
@@ -207,49 +383,63 @@ def parse_tacview_xml(xml_path: str) -> dict:
         # Post-process to clean up data
         return finalize_pilot_data(pilot_missions)
         
+    except APIError:
+        raise
+    except ET.ParseError as e:
+        if validate:
+            raise invalid_xml(f"Invalid XML format: {str(e)}")
+        logger.error(f"Error parsing Tacview XML: {e}")
+        return {}
     except Exception as e:
         logger.error(f"Error parsing Tacview XML: {e}")
         return {}
 
+def new_position_track() -> tuple:
+    """Per-pilot (times, lats, lons) samples, kept as parallel double arrays"""
+    return (array('d'), array('d'), array('d'))
+
+def compute_flight_minutes(track: tuple) -> int:
+    """Flight minutes for one (times, lats, lons) track, excluding stationary time (>15 minutes)"""
+    times, lats, lons = track
+    
+    # Visit samples in time order (stable, so equal times keep arrival order)
+    order = sorted(range(len(times)), key=times.__getitem__)
+
+    total_flight_time = 0
+    stationary_start = None
+    first = order[0]
+    last_time, last_lat, last_lon = times[first], lats[first], lons[first]
+
+    for i in islice(order, 1, None):
+        time_val = times[i]
+        lat = lats[i]
+        lon = lons[i]
+        dlat = lat - last_lat
+        dlon = lon - last_lon
+    
+        # If stationary for more than 15 minutes (900 seconds), don't count this time
+        if dlat * dlat + dlon * dlon < STATIONARY_DEG2:  # Less than 100 meters movement
+            if stationary_start is None:
+                stationary_start = last_time
+            elif time_val - stationary_start > 900:  # 15 minutes
+                # Don't count this time as flight time
+                continue
+        else:
+            # Moving, reset stationary timer
+            stationary_start = None
+    
+        total_flight_time += time_val - last_time
+        last_time, last_lat, last_lon = time_val, lat, lon
+
+    return int(total_flight_time / 60)
+
 def calculate_actual_flight_hours(pilot_missions: dict, pilot_positions: dict):
     """Calculate actual flight hours excluding stationary time (>15 minutes)"""
     try:
         for pilot_name, positions in pilot_positions.items():
-            if pilot_name not in pilot_missions:
-                continue
-            
-            if not positions:
-                continue
-            
-            # Sort positions by time
-            positions.sort(key=lambda x: x['time'])
-        
-            total_flight_time = 0
-            last_position = None
-            stationary_start = None
-        
-            for pos in positions:
-                if last_position is not None:
-                    time_diff = pos['time'] - last_position['time']
-                    distance = calculate_distance(last_position, pos)
-                
-                    # If stationary for more than 15 minutes (900 seconds), don't count this time
-                    if distance < 100:  # Less than 100 meters movement
-                        if stationary_start is None:
-                            stationary_start = last_position['time']
-                        elif pos['time'] - stationary_start > 900:  # 15 minutes
-                            # Don't count this time as flight time
-                            continue
-                    else:
-                        # Moving, reset stationary timer
-                        stationary_start = None
-                
-                    total_flight_time += time_diff
-            
-                last_position = pos
-        
-            # Update flight hours
-            pilot_missions[pilot_name]["flight_minutes"] = int(total_flight_time / 60) if total_flight_time is not None else 0
+            if pilot_name in pilot_missions and positions[0]:
+                # Update flight hours
+                pilot_missions[pilot_name]["flight_minutes"] = compute_flight_minutes(positions)
     except Exception as e:
         logger.warning(f"Warning: Could not calculate actual flight hours, using default: {e}")
         # Ensure all pilots have a default flight_minutes value
@@ -257,66 +447,137 @@ def calculate_actual_flight_hours(pilot_missions: dict, pilot_positions: dict):
             if "flight_minutes" not in pilot_missions[pilot_name]:
                 pilot_missions[pilot_name]["flight_minutes"] = 0
 
-def calculate_distance(pos1: dict, pos2: dict) -> float:
-    """Calculate distance between two positions"""
-    try:
-        lat1, lon1 = pos1['lat'], pos1['lon']
-        lat2, lon2 = pos2['lat'], pos2['lon']
+def calculate_distance(pos1: tuple, pos2: tuple) -> float:
+    """Calculate distance in meters between two (time, lat, lon) positions"""
+    _, lat1, lon1 = pos1
+    _, lat2, lon2 = pos2
     
-        # Simple distance calculation (approximate)
-        return math.sqrt((lat2 - lat1)**2 + (lon2 - lon1)**2) * 111000  # Convert to meters
-    except Exception as e:
-        logger.warning(f"Warning: Could not calculate distance, returning 0: {e}")
-        return 0.0
+    # Equirectangular approximation, scaling longitude by the mean latitude
+    dlat = lat2 - lat1
+    dlon = (lon2 - lon1) * math.cos(math.radians((lat1 + lat2) / 2))
+    return math.hypot(dlat, dlon) * METERS_PER_DEGREE
+
+def resolve_nickname_cached(pilot: str, nick_cache: dict = None) -> str:
+    """Resolve a pilot name to its nickname, memoized in nick_cache when given"""
+    if nick_cache is None:
+        return resolve_fuzzy_nickname(pilot)
+    nickname = nick_cache.get(pilot)
+    if nickname is None:
+        # Interned so every record and dict key shares one string per pilot
+        nickname = nick_cache[pilot] = sys.intern(resolve_fuzzy_nickname(pilot))
+    return nickname
+
+def child_elements(elem) -> dict:
+    """Map each child tag to its first child element, as find() would return it"""
+    children = {}
+    for child in elem:
+        children.setdefault(child.tag, child)
+    return children
+
+def child_text(children: dict, tag: str, default=None):
+    """findtext() equivalent over a child_elements() map"""
+    child = children.get(tag)
+    if child is None:
+        return default
+    return child.text or ""
 
-def process_event(event, pilot_missions: dict, ground_types: set, pilot_positions: dict):
-    """Process a single event from the XML"""
+def event_position(event_children: dict):
+    """(time, lat, lon) of an event from its child_elements() map, or None"""
+    location = event_children.get("Location")
+    if location is None:
+        return None
+    
+    lat = location.findtext("Latitude")
+    lon = location.findtext("Longitude")
+    time_elem = event_children.get("Time")
     try:
-        action = event.findtext("Action")
-        primary = event.find("PrimaryObject")
-        secondary = event.find("SecondaryObject")
+        time_val = float(time_elem.text) if time_elem is not None and time_elem.text else 0
+        if lat and lon and time_val:
+            return (time_val, float(lat), float(lon))
+    except ValueError as e:
+        # A bad coordinate only loses the sample; the event itself is still counted
+        logger.warning(f"Invalid event position, skipping sample: {e}")
+    return None
+
+def check_event_client(pilot: str, aircraft: str, group: str, squadron_callsigns: tuple):
+    """Validate and sanitize an event's pilot and aircraft and check for a player client
     
-        if primary is None:
-            return
+    Returns the cleaned (pilot, aircraft) for a player client, False for AI and
+    None for an invalid pilot name.
+    """
+    # Validate pilot name
+    is_valid, error = validate_pilot_name(pilot)
+    if not is_valid:
+        logger.warning(f"Invalid pilot name '{pilot}': {error}")
+        return None
     
-        pilot = primary.findtext("Pilot", default="").strip()
-        aircraft = primary.findtext("Name", default="Unknown")
-        group = primary.findtext("Group", default="")
+    # Sanitize pilot name
+    pilot = sanitize_string(pilot, 100)
     
-        # Validate and sanitize pilot name
-        if not pilot or pilot.lower() == "unknown":
-            return
+    # Validate aircraft name
+    is_valid, error = validate_aircraft_name(aircraft)
+    if not is_valid:
+        logger.warning(f"Invalid aircraft name '{aircraft}': {error}")
+        aircraft = "Unknown"
     
-        # Validate pilot name
-        is_valid, error = validate_pilot_name(pilot)
-        if not is_valid:
-            logger.warning(f"Invalid pilot name '{pilot}': {error}")
-            return
+    # Sanitize aircraft name
+    aircraft = sanitize_string(aircraft, 100)
     
-        # Sanitize pilot name
-        pilot = sanitize_string(pilot, 100)
+    # Debug: Log all pilots being checked; lazy so the message is only built when enabled
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Checking pilot: '%s' (aircraft: %s, group: %s)", pilot, aircraft, group)
     
-        # Validate aircraft name
-        is_valid, error = validate_aircraft_name(aircraft)
-        if not is_valid:
-            logger.warning(f"Invalid aircraft name '{aircraft}': {error}")
-            aircraft = "Unknown"
+    # Only process player clients, not AI
+    if not is_player_client_cached(pilot, aircraft, group, squadron_callsigns):
+        return False
     
-        # Sanitize aircraft name
-        aircraft = sanitize_string(aircraft, 100)
+    return pilot, aircraft
+
+def process_event(event, pilot_missions: dict, pilot_positions: dict, nick_cache: dict = None,
+                  ground_types: frozenset = GROUND_TYPES, squadron_callsigns: tuple = None,
+                  client_cache: dict = None):
+    """Process a single event from the XML
     
-        # Debug: Log all pilots being checked
-        logger.info(f"Checking pilot: '{pilot}' (aircraft: {aircraft}, group: {group})")
+    Returns True for a player event, False for one filtered out as AI and None
+    for an event that was skipped or failed.
+    """
+    try:
+        if squadron_callsigns is None:
+            squadron_callsigns = tuple(load_squadron_callsigns_safe())
+        
+        # One pass over the event's children instead of a find() per field
+        event_children = child_elements(event)
+        action = child_text(event_children, "Action")
+        primary = event_children.get("PrimaryObject")
+        secondary = event_children.get("SecondaryObject")
     
-        # Only process player clients, not AI
-        if not is_player_client(pilot, aircraft, group):
-            logger.info(f"  -> FILTERED OUT (AI)")
+        if primary is None:
             return
     
-        logger.info(f"  -> ACCEPTED (Player)")
+        primary_children = child_elements(primary)
+        pilot = child_text(primary_children, "Pilot", "").strip()
+        aircraft = child_text(primary_children, "Name", "Unknown")
+        group = child_text(primary_children, "Group", "")
+    
+        # Validate and sanitize pilot name
+        if not pilot or pilot.lower() == "unknown":
+            return
+    
+        # Repeated (pilot, aircraft, group) triples skip validation and the player check
+        client_key = (pilot, aircraft, group)
+        if client_cache is not None and client_key in client_cache:
+            client = client_cache[client_key]
+        else:
+            client = check_event_client(pilot, aircraft, group, squadron_callsigns)
+            if client_cache is not None:
+                client_cache[client_key] = client
+        
+        if not client:
+            return client
+        pilot, aircraft = client
     
         # Resolve nickname using fuzzy matching
-        nickname = resolve_fuzzy_nickname(pilot)
+        nickname = resolve_nickname_cached(pilot, nick_cache)
     
         # Validate nickname
         is_valid, error = validate_pilot_name(nickname)
@@ -324,65 +585,60 @@ def process_event(event, pilot_missions: dict, ground_types: set, pilot_position
             logger.warning(f"Invalid nickname '{nickname}': {error}")
             return
     
+        # Look the pilot's record up once; the counters below update it in place
+        mission = pilot_missions[nickname]
+    
         # Track all nicknames for this pilot
-        if pilot not in pilot_missions[nickname]["nicknames"]:
-            pilot_missions[nickname]["nicknames"].append(pilot)
+        nickname_set = mission["_nickname_set"]
+        if pilot not in nickname_set:
+            nickname_set.add(pilot)
+            mission["nicknames"].append(pilot)
     
         # Update aircraft info (last seen aircraft for this pilot)
-        pilot_missions[nickname]["aircraft"] = aircraft
+        mission["aircraft"] = aircraft
     
         # Track position for flight time calculation
-        location = event.find("Location")
-        if location is not None:
-            lat = location.findtext("Latitude")
-            lon = location.findtext("Longitude")
-            time_elem = event.find("Time")
-            time_val = float(time_elem.text) if time_elem is not None and time_elem.text else 0
-        
-            if lat and lon and time_val:
-                pilot_positions[nickname].append({
-                    'lat': float(lat),
-                    'lon': float(lon),
-                    'time': time_val
-                })
+        position = event_position(event_children)
+        if position is not None:
+            times, lats, lons = pilot_positions[nickname]
+            times.append(position[0])
+            lats.append(position[1])
+            lons.append(position[2])
     
         # Process different event types
         if action == "HasBeenDestroyed":
+            # Primary object was destroyed (pilot death), whether or not someone is credited with it
+            mission["kia"] += 1
+            mission["deaths"] += 1
+            
             if secondary is not None:
                 # Someone destroyed something
-                attacker = secondary.findtext("Pilot", "").strip()
-                if attacker and attacker.lower() != "unknown" and is_player_client(attacker, aircraft, group):
-                    attacker_nick = resolve_fuzzy_nickname(attacker)
-                    destroyed_type = primary.findtext("Type", "")
-                    destroyed_coalition = primary.findtext("Coalition", "")
-                    attacker_coalition = secondary.findtext("Coalition", "")
+                secondary_children = child_elements(secondary)
+                attacker = child_text(secondary_children, "Pilot", "").strip()
+                if attacker and attacker.lower() != "unknown" and is_player_client_cached(attacker, aircraft, group, squadron_callsigns):
+                    attacker_nick = resolve_nickname_cached(attacker, nick_cache)
+                    destroyed_type = child_text(primary_children, "Type", "")
+                    destroyed_coalition = child_text(primary_children, "Coalition", "")
+                    attacker_coalition = child_text(secondary_children, "Coalition", "")
                 
                     # Check for friendly fire
                     if destroyed_coalition == attacker_coalition and destroyed_coalition:
-                        pilot_missions[attacker_nick]["frat_kills"] += 1
+                        kill_type = "frat_kills"
                     elif destroyed_type in ground_types:
-                        pilot_missions[attacker_nick]["ag_kills"] += 1
+                        kill_type = "ag_kills"
                     else:
-                        pilot_missions[attacker_nick]["aa_kills"] += 1
-            else:
-                # Primary object was destroyed (pilot death)
-                victim_nick = resolve_fuzzy_nickname(pilot)
-                pilot_missions[victim_nick]["kia"] += 1
-                pilot_missions[victim_nick]["deaths"] += 1
+                        kill_type = "aa_kills"
+                    pilot_missions[attacker_nick][kill_type] += 1
             
-        elif action == "HasLanded":
-            pilot_missions[nickname]["rtb"] += 1
-        
-        elif action == "HasEjected":
-            pilot_missions[nickname]["ejections"] += 1
+        elif action in ACTION_COUNTERS:
+            mission[ACTION_COUNTERS[action]] += 1
         
-        elif action == "HasTakenOff":
-            # Could track multiple sorties per pilot
-            pass  # Already counting sorties in initialization
+        # HasTakenOff: already counting sorties in initialization
+        return True
     except Exception as e:
-        logger.error(f"Error processing event: {e}")
-        # Continue processing other events even if one fails
-        pass
+        # Bad positions are handled in event_position, so anything reaching here
+        # is unexpected; keep the traceback and continue with the other events
+        logger.error(f"Error processing event: {e}", exc_info=True)
     
 
 def extract_mission_name(root, xml_path: str) -> str:
@@ -430,80 +686,49 @@ def extract_mission_date(root) -> str:
         logger.warning(f"Warning: Could not extract mission date, using default: {e}")
         return datetime.now().strftime("%Y-%m-%d")
 
-def extract_mission_duration(root) -> int:
-    """Extract mission duration in seconds"""
+def extract_mission_duration(root):
+    """Extract mission duration in seconds from <Duration>, or None if absent
+    
+    parse_tacview_xml falls back to the span of event times while streaming.
+    """
     duration_elem = root.find(".//Duration")
     if duration_elem is not None and duration_elem.text:
         try:
             return int(float(duration_elem.text))
-        except:
+        except ValueError:
             pass
-    
-    # Try to calculate from events
-    events = root.find("Events")
-    if events is not None:
-        timestamps = []
-        for event in events.findall("Event"):
-            time_elem = event.find("Time")
-            if time_elem is not None and time_elem.text:
-                try:
-                    timestamps.append(float(time_elem.text))
-                except:
-                    continue
-        
-        if len(timestamps) >= 2:
-            return int(max(timestamps) - min(timestamps))
-    
-    # Default duration (45 minutes)
-    return 2700
+    return None
 
+# Platform keywords, checked in order against the generator and then the source
+PLATFORM_KEYWORDS = (
+    ("DCS", ("dcs",)),
+    ("BMS", ("bms", "falcon")),
+    ("IL2", ("il2", "il-2", "sturmovik")),
+)
 
-def extract_mission_duration_safe(root) -> int:
-    """Extract mission duration in seconds with safety checks"""
-    try:
-        duration = extract_mission_duration(root)
-        return duration if duration is not None else 2700
-    except Exception:
-        return 2700  # Default to 45 minutes
+@functools.lru_cache(maxsize=8)
+def classify_platform(generator: str, source: str) -> str:
+    """Platform for the lowercased generator attribute and Source text"""
+    # Check generator field
+    for platform, keywords in PLATFORM_KEYWORDS:
+        if any(keyword in generator for keyword in keywords):
+            return platform
+    if "tacview" in generator:
+        return "Tacview"  # Generic
+    
+    # Check source field
+    for platform, keywords in PLATFORM_KEYWORDS:
+        if any(keyword in source for keyword in keywords):
+            return platform
+    return "DCS"  # Default
 
 def detect_platform(root) -> str:
     """Detect if this is from DCS, BMS, IL2, or other sim"""
     try:
         # Look for platform indicators in the XML
-        generator = root.get("generator", "").lower() if root.get("generator") else ""
-        source = root.findtext(".//Source", "").lower() if root.findtext(".//Source") else ""
-    
-        # Check generator field
-        if "dcs" in generator:
-            platform = "DCS"
-        elif "bms" in generator or "falcon" in generator:
-            platform = "BMS"
-        elif "il2" in generator or "il-2" in generator or "sturmovik" in generator:
-            platform = "IL2"
-        elif "tacview" in generator:
-            platform = "Tacview"  # Generic
-        else:
-            # Check source field
-            if "dcs" in source:
-                platform = "DCS"
-            elif "bms" in source or "falcon" in source:
-                platform = "BMS"
-            elif "il2" in source or "il-2" in source or "sturmovik" in source:
-                platform = "IL2"
-            else:
-                # Check for DCS-specific elements
-                if root.find(".//Mission") is not None:
-                    mission_elem = root.find(".//Mission")
-                    if mission_elem is not None:
-                        title = mission_elem.findtext("Title", "").lower() if mission_elem.findtext("Title") else ""
-                        if any(keyword in title for keyword in ["dcs", "digital combat simulator"]):
-                            platform = "DCS"
-                        else:
-                            platform = "DCS"  # Default
-                    else:
-                        platform = "DCS"  # Default
-                else:
-                    platform = "DCS"  # Default
+        generator = (root.get("generator") or "").lower()
+        source = (root.findtext(".//Source") or "").lower()
+        platform = classify_platform(generator, source)
     
         # Validate platform
         is_valid, error = validate_platform(platform)
@@ -522,76 +747,66 @@ def format_duration_from_seconds(seconds: float) -> str:
     minutes = int((seconds % 3600) // 60)
     return f"{hours}:{minutes:02d}"
 
+# Fields checked by finalize_pilot_data
+PILOT_NUMERIC_FIELDS = ('aa_kills', 'ag_kills', 'frat_kills', 'rtb', 'ejections', 'deaths', 'flight_minutes')
+PILOT_STRING_FIELDS = (
+    # (field, validator, fallback value, name used in warnings)
+    ('mission', validate_mission_name, "Unknown Mission", "mission name"),
+    ('aircraft', validate_aircraft_name, "Unknown", "aircraft"),
+    ('platform', validate_platform, "DCS", "platform"),
+)
+
 def finalize_pilot_data(pilot_missions: dict) -> dict:
     """Clean up and validate pilot data before returning"""
     try:
         finalized = {}
     
         for nickname, data in pilot_missions.items():
+            data.pop("_nickname_set", None)
+            
             # Validate pilot data structure
             try:
-                # Validate numeric fields
-                numeric_fields = ['aa_kills', 'ag_kills', 'frat_kills', 'rtb', 'ejections', 'deaths', 'flight_minutes']
-                for field in numeric_fields:
-                    if field in data:
-                        # Ensure the field value is not None
-                        field_value = data[field] if data[field] is not None else 0
-                        is_valid, error = validate_numeric_value(field_value, field, min_val=0, max_val=10000)
-                        if not is_valid:
-                            logger.warning(f"Invalid {field} for {nickname}: {error}")
-                            data[field] = 0
-            
-                # Validate string fields
-                if 'mission' in data:
-                    mission_name = data['mission'] if data['mission'] is not None else "Unknown Mission"
-                    is_valid, error = validate_mission_name(mission_name)
+                # Validate numeric fields; in-range ints are the common case and skip the validator
+                for field in PILOT_NUMERIC_FIELDS:
+                    field_value = data.get(field)
+                    if field_value is None or (type(field_value) is int and 0 <= field_value <= 10000):
+                        continue
+                    is_valid, error = validate_numeric_value(field_value, field, min_val=0, max_val=10000)
                     if not is_valid:
-                        logger.warning(f"Invalid mission name for {nickname}: {error}")
-                        data['mission'] = "Unknown Mission"
+                        logger.warning(f"Invalid {field} for {nickname}: {error}")
+                        data[field] = 0
             
-                if 'aircraft' in data:
-                    aircraft_name = data['aircraft'] if data['aircraft'] is not None else "Unknown"
-                    is_valid, error = validate_aircraft_name(aircraft_name)
+                # Validate and sanitize string fields in one pass
+                for field, validator, default, label in PILOT_STRING_FIELDS:
+                    if field not in data:
+                        continue
+                    field_value = data[field]
+                    is_valid, error = validator(field_value if field_value is not None else default)
                     if not is_valid:
-                        logger.warning(f"Invalid aircraft for {nickname}: {error}")
-                        data['aircraft'] = "Unknown"
-            
-                if 'platform' in data:
-                    platform_name = data['platform'] if data['platform'] is not None else "DCS"
-                    is_valid, error = validate_platform(platform_name)
-                    if not is_valid:
-                        logger.warning(f"Invalid platform for {nickname}: {error}")
-                        data['platform'] = "DCS"
-            
-                # Sanitize string fields
-                for field in ['mission', 'aircraft', 'platform']:
-                    if field in data:
-                        field_value = data[field] if data[field] is not None else ""
-                        data[field] = sanitize_string(field_value, 200)
+                        logger.warning(f"Invalid {label} for {nickname}: {error}")
+                        field_value = default
+                    data[field] = sanitize_string(field_value if field_value is not None else "", 200)
             
             except Exception as e:
                 logger.error(f"Error validating pilot data for {nickname}: {e}")
                 continue
         
-            # Skip pilots with no activity
-            total_activity = (data.get("aa_kills", 0) or 0) + (data.get("ag_kills", 0) or 0) + \
-                             (data.get("frat_kills", 0) or 0) + (data.get("rtb", 0) or 0) + (data.get("kia", 0) or 0)
+            # Skip pilots with no activity; each counter is read once
+            total_kills = (data.get("aa_kills", 0) or 0) + (data.get("ag_kills", 0) or 0)
+            total_activity = total_kills + (data.get("frat_kills", 0) or 0) + \
+                             (data.get("rtb", 0) or 0) + (data.get("kia", 0) or 0)
         
+            # flight_minutes is already an int from the parse or calculate_actual_flight_hours
             if total_activity > 0 or (data.get("flight_minutes", 0) or 0) > 0:
-                # Calculate total kills
-                data["total_kills"] = (data.get("aa_kills", 0) or 0) + (data.get("ag_kills", 0) or 0)
+                data["total_kills"] = total_kills
             
                 # Calculate K/D ratio
                 deaths = data.get("deaths", 0) or 0
-                total_kills = data.get("total_kills", 0) or 0
                 if deaths == 0:
                     data["kd_ratio"] = "∞" if total_kills > 0 else "N/A"
                 else:
                     data["kd_ratio"] = f"{total_kills / deaths:.2f}" if deaths > 0 else "N/A"
             
-                # Ensure flight_minutes is an integer
-                data["flight_minutes"] = int(data.get("flight_minutes", 0) or 0)
-            
                 finalized[nickname] = data
     
         return finalized
@@ -599,8 +814,201 @@ def finalize_pilot_data(pilot_missions: dict) -> dict:
         logger.error(f"Error finalizing pilot data: {e}")
         return {}
 
-def is_player_client(pilot_name: str, aircraft_name: str, group: str = "") -> bool:
-    """Determine if this is a player client (not AI)"""
+# Aircraft flown by player clients; anything else is treated as AI
+PLAYER_AIRCRAFT = (
+    # Full fidelity modules
+    "DCS: F4U-1D Corsair",
+    "DCS: F-5E Remastered", 
+    "DCS: Flaming Cliffs 2024",
+    "DCS: F-4E Phantom II",
+    "DCS: F-15E",
+    "DCS: MB-339",
+    "DCS: Mirage F1",
+    "DCS: Mosquito FB VI",
+    "DCS: A-10C II Tank Killer",
+    "DCS: P-47D Thunderbolt",
+    "DCS: JF-17 Thunder",
+    "DCS: F-16C Viper",
+    "DCS: Fw 190 A-8",
+    "DCS: I-16",
+    "DCS: MiG-19P Farmer",
+    "DCS: Christen Eagle II",
+    "DCS: F-14 Tomcat",
+    "DCS: Yak-52",
+    "DCS: F/A-18C",
+    "DCS: AV-8B Night Attack V/STOL",
+    "DCS: AJS-37 Viggen",
+    "DCS: Spitfire LF Mk. IX",
+    "DCS: F-5E",
+    "DCS: M-2000C",
+    "DCS: L-39 Albatros",
+    "DCS: C-101 Aviojet",
+    "DCS: Bf 109 K-4 Kurfürst",
+    "DCS: MiG-21bis",
+    "DCS: Fw 190 D-9 Dora",
+    "DCS: P-51D Mustang",
+    "DCS: A-10C Warthog",
+    "A-4 Skyhawk",
+    "A-4E",
+    
+    # Helicopters
+    "DCS: UH-1H Huey",
+    "DCS: Mi-8MT Hip",
+    "DCS: Ka-50 Black Shark",
+    "DCS: SA342 Gazelle",
+    "DCS: Mi-24P Hind",
+    "DCS: AH-64D Apache",
+    "DCS: OH-58D Kiowa Warrior",
+    "DCS: AH-64E Apache",
+    "DCS: Mi-28N Havoc",
+    "DCS: Ka-50-3 Black Shark",
+    "DCS: CH-47F Chinook",
+    "DCS: UH-60L Black Hawk",
+    "DCS: Mi-17 Hip",
+    "DCS: AH-1W Super Cobra",
+    "DCS: AH-1Z Viper",
+    "DCS: UH-1Y Venom",
+    "DCS: Mi-26 Halo",
+    "DCS: Ka-27 Helix",
+    "DCS: Ka-29 Helix",
+    "DCS: Mi-35M Hind",
+    "DCS: Mi-28 Havoc",
+    "DCS: AH-6J Little Bird",
+    "DCS: OH-6A Cayuse",
+    "DCS: UH-1N Twin Huey",
+    "DCS: CH-53E Super Stallion",
+    "DCS: CH-46 Sea Knight",
+    "DCS: V-22 Osprey",
+    "DCS: Mi-8",
+    "DCS: Ka-50",
+    "DCS: AH-64",
+    "DCS: UH-1",
+    "DCS: Mi-24",
+    "DCS: SA342",
+    "DCS: OH-58D",
+    "DCS: CH-47",
+    "DCS: UH-60",
+    "DCS: Mi-17",
+    "DCS: AH-1",
+    "DCS: Mi-26",
+    "DCS: Ka-27",
+    "DCS: Mi-35",
+    "DCS: AH-6",
+    "DCS: OH-6",
+    "DCS: CH-53",
+    "DCS: CH-46",
+    "DCS: V-22",
+    
+    # Flaming Cliffs aircraft (simplified names)
+    "MiG-15bis",
+    "F-5E Flaming Cliffs",
+    "F-86F Flaming Cliffs", 
+    "MiG-29 Flaming Cliffs",
+    "Su-33 Flaming Cliffs",
+    "Su-27 Flaming Cliffs",
+    "F-15C Flaming Cliffs",
+    "Su-25 Flaming Cliffs",
+    "A-10A Flaming Cliffs",
+    "F-86F Sabre",
+    
+    # Alternative names that might appear
+    "F-4E Phantom",
+    "F-15E Strike Eagle",
+    "F-16C",
+    "F/A-18C Hornet",
+    "AV-8B",
+    "A-10C",
+    "P-51D",
+    "MiG-21",
+    "MiG-29",
+    "Su-27",
+    "Su-33",
+    "F-15C",
+    "Su-25",
+    "A-10A",
+    "F-5E",
+    "F-86F",
+    "MiG-15",
+    "Fw 190",
+    "Bf 109",
+    "Spitfire",
+    "Mosquito",
+    "Corsair",
+    "Thunderbolt",
+    "Mustang",
+    "Viggen",
+    "Mirage F1",
+    "M-2000C",
+    "L-39",
+    "C-101",
+    "Yak-52",
+    "Christen Eagle",
+    "JF-17",
+    "I-16",
+    "MiG-19",
+    "Fw 190 A-8",
+    "Fw 190 D-9",
+    "Bf 109 K-4",
+    "MB-339",
+    "AJS-37",
+    "AV-8B Night Attack",
+    "A-4 Skyhawk",
+    "A-4E Skyhawk",
+    
+    # Additional helicopter names
+    "Huey",
+    "Hip",
+    "Black Shark",
+    "Gazelle",
+    "Hind",
+    "Apache",
+    "Kiowa",
+    "Havoc",
+    "Chinook",
+    "Black Hawk",
+    "Super Cobra",
+    "Viper",
+    "Venom",
+    "Halo",
+    "Helix",
+    "Little Bird",
+    "Cayuse",
+    "Twin Huey",
+    "Super Stallion",
+    "Sea Knight",
+    "Osprey"
+)
+PLAYER_AIRCRAFT_LOWER = tuple(aircraft.lower() for aircraft in PLAYER_AIRCRAFT)
+PLAYER_AIRCRAFT_LOWER_SET = frozenset(PLAYER_AIRCRAFT_LOWER)
+
+@functools.lru_cache(maxsize=1024)
+def is_player_aircraft(aircraft_lower: str) -> bool:
+    """Whether a lowercased aircraft name matches the player aircraft whitelist
+    
+    Aircraft names repeat across every pilot in a mission, so the substring
+    scan over PLAYER_AIRCRAFT_LOWER runs once per distinct name, and not at
+    all for an exact whitelist entry.
+    """
+    if aircraft_lower in PLAYER_AIRCRAFT_LOWER_SET:
+        return True
+    return any(
+        allowed in aircraft_lower or aircraft_lower in allowed
+        for allowed in PLAYER_AIRCRAFT_LOWER
+    )
+
+@functools.lru_cache(maxsize=8)
+def squadron_matcher(squadron_callsigns: tuple) -> tuple:
+    """Compiled pattern matching any lowercased callsign, plus the lowercased callsigns"""
+    callsigns_lower = tuple(callsign.lower() for callsign in squadron_callsigns)
+    pattern = re.compile("|".join(re.escape(callsign) for callsign in callsigns_lower))
+    return pattern, callsigns_lower
+
+def is_player_client(pilot_name: str, aircraft_name: str, group: str = "",
+                     squadron_callsigns: list = None) -> bool:
+    """Determine if this is a player client (not AI)
+    
+    squadron_callsigns can be passed in to skip reloading the config per call.
+    """
     if not pilot_name or pilot_name.lower() == "unknown":
         return False
     
@@ -608,235 +1016,58 @@ def is_player_client(pilot_name: str, aircraft_name: str, group: str = "") -> bo
     if is_known_player(pilot_name):
         return True
     
-    # Only accept pilots flying specific player aircraft
-    player_aircraft = [
-        # Full fidelity modules
-        "DCS: F4U-1D Corsair",
-        "DCS: F-5E Remastered", 
-        "DCS: Flaming Cliffs 2024",
-        "DCS: F-4E Phantom II",
-        "DCS: F-15E",
-        "DCS: MB-339",
-        "DCS: Mirage F1",
-        "DCS: Mosquito FB VI",
-        "DCS: A-10C II Tank Killer",
-        "DCS: P-47D Thunderbolt",
-        "DCS: JF-17 Thunder",
-        "DCS: F-16C Viper",
-        "DCS: Fw 190 A-8",
-        "DCS: I-16",
-        "DCS: MiG-19P Farmer",
-        "DCS: Christen Eagle II",
-        "DCS: F-14 Tomcat",
-        "DCS: Yak-52",
-        "DCS: F/A-18C",
-        "DCS: AV-8B Night Attack V/STOL",
-        "DCS: AJS-37 Viggen",
-        "DCS: Spitfire LF Mk. IX",
-        "DCS: F-5E",
-        "DCS: M-2000C",
-        "DCS: L-39 Albatros",
-        "DCS: C-101 Aviojet",
-        "DCS: Bf 109 K-4 Kurfürst",
-        "DCS: MiG-21bis",
-        "DCS: Fw 190 D-9 Dora",
-        "DCS: P-51D Mustang",
-        "DCS: A-10C Warthog",
-        "A-4 Skyhawk",
-        "A-4E",
-        
-        # Helicopters
-        "DCS: UH-1H Huey",
-        "DCS: Mi-8MT Hip",
-        "DCS: Ka-50 Black Shark",
-        "DCS: SA342 Gazelle",
-        "DCS: Mi-24P Hind",
-        "DCS: AH-64D Apache",
-        "DCS: OH-58D Kiowa Warrior",
-        "DCS: AH-64E Apache",
-        "DCS: Mi-28N Havoc",
-        "DCS: Ka-50-3 Black Shark",
-        "DCS: CH-47F Chinook",
-        "DCS: UH-60L Black Hawk",
-        "DCS: Mi-17 Hip",
-        "DCS: AH-1W Super Cobra",
-        "DCS: AH-1Z Viper",
-        "DCS: UH-1Y Venom",
-        "DCS: Mi-26 Halo",
-        "DCS: Ka-27 Helix",
-        "DCS: Ka-29 Helix",
-        "DCS: Mi-35M Hind",
-        "DCS: Mi-28 Havoc",
-        "DCS: AH-6J Little Bird",
-        "DCS: OH-6A Cayuse",
-        "DCS: UH-1N Twin Huey",
-        "DCS: CH-53E Super Stallion",
-        "DCS: CH-46 Sea Knight",
-        "DCS: V-22 Osprey",
-        "DCS: Mi-8",
-        "DCS: Ka-50",
-        "DCS: AH-64",
-        "DCS: UH-1",
-        "DCS: Mi-24",
-        "DCS: SA342",
-        "DCS: OH-58D",
-        "DCS: CH-47",
-        "DCS: UH-60",
-        "DCS: Mi-17",
-        "DCS: AH-1",
-        "DCS: Mi-26",
-        "DCS: Ka-27",
-        "DCS: Mi-35",
-        "DCS: AH-6",
-        "DCS: OH-6",
-        "DCS: CH-53",
-        "DCS: CH-46",
-        "DCS: V-22",
-        
-        # Flaming Cliffs aircraft (simplified names)
-        "MiG-15bis",
-        "F-5E Flaming Cliffs",
-        "F-86F Flaming Cliffs", 
-        "MiG-29 Flaming Cliffs",
-        "Su-33 Flaming Cliffs",
-        "Su-27 Flaming Cliffs",
-        "F-15C Flaming Cliffs",
-        "Su-25 Flaming Cliffs",
-        "A-10A Flaming Cliffs",
-        "F-86F Sabre",
-        
-        # Alternative names that might appear
-        "F-4E Phantom",
-        "F-15E Strike Eagle",
-        "F-16C",
-        "F/A-18C Hornet",
-        "AV-8B",
-        "A-10C",
-        "P-51D",
-        "MiG-21",
-        "MiG-29",
-        "Su-27",
-        "Su-33",
-        "F-15C",
-        "Su-25",
-        "A-10A",
-        "F-5E",
-        "F-86F",
-        "MiG-15",
-        "Fw 190",
-        "Bf 109",
-        "Spitfire",
-        "Mosquito",
-        "Corsair",
-        "Thunderbolt",
-        "Mustang",
-        "Viggen",
-        "Mirage F1",
-        "M-2000C",
-        "L-39",
-        "C-101",
-        "Yak-52",
-        "Christen Eagle",
-        "JF-17",
-        "I-16",
-        "MiG-19",
-        "Fw 190 A-8",
-        "Fw 190 D-9",
-        "Bf 109 K-4",
-        "MB-339",
-        "AJS-37",
-        "AV-8B Night Attack",
-        "A-4 Skyhawk",
-        "A-4E Skyhawk",
-        
-        # Additional helicopter names
-        "Huey",
-        "Hip",
-        "Black Shark",
-        "Gazelle",
-        "Hind",
-        "Apache",
-        "Kiowa",
-        "Havoc",
-        "Chinook",
-        "Black Hawk",
-        "Super Cobra",
-        "Viper",
-        "Venom",
-        "Halo",
-        "Helix",
-        "Little Bird",
-        "Cayuse",
-        "Twin Huey",
-        "Super Stallion",
-        "Sea Knight",
-        "Osprey"
-    ]
-    
-    # Check if the aircraft is in our whitelist
-    aircraft_lower = aircraft_name.lower() if aircraft_name else ""
-    aircraft_allowed = False
-    
-    for allowed_aircraft in player_aircraft:
-        if allowed_aircraft.lower() in aircraft_lower or aircraft_lower in allowed_aircraft.lower():
-            aircraft_allowed = True
-            break
-    
-    # If aircraft not in whitelist, it's AI
-    if not aircraft_allowed:
+    
+    # Only accept pilots flying specific player aircraft; if not in whitelist, it's AI
+    if not is_player_aircraft(aircraft_name.lower() if aircraft_name else ""):
         return False
     
     # Now check if pilot name matches squadron callsigns
-    # Load squadron callsigns from config
-    squadron_callsigns = load_squadron_callsigns_safe()
+    # Load squadron callsigns from config unless the caller already has them
+    if squadron_callsigns is None:
+        squadron_callsigns = load_squadron_callsigns_safe()
     
     if not squadron_callsigns:
         # If no squadron callsigns configured, accept all player aircraft pilots
         return True
     
-    # Check if pilot name contains any squadron callsign
+    # Check if pilot name contains any squadron callsign, or is part of one.
+    # The FLIGHTCALLSIGN | PERSONALCALLSIGN and FLIGHTCALLSIGN - PERSONALCALLSIGN
+    # parts are substrings of the name, so one scan of the full name covers them.
     pilot_lower = pilot_name.lower()
+    callsign_pattern, callsigns_lower = squadron_matcher(tuple(squadron_callsigns))
     
-    for callsign in squadron_callsigns:
-        callsign_lower = callsign.lower()
-        
-        # Direct match
-        if callsign_lower in pilot_lower or pilot_lower in callsign_lower:
-            return True
-        
-        # Check for FLIGHTCALLSIGN | PERSONALCALLSIGN pattern
-        if "|" in pilot_name:
-            parts = pilot_name.split("|")
-            if len(parts) == 2:
-                left_part = parts[0].strip().lower()
-                right_part = parts[1].strip().lower()
-                
-                # Check if callsign appears in either part
-                if callsign_lower in left_part or callsign_lower in right_part:
-                    return True
-        
-        # Check for FLIGHTCALLSIGN - PERSONALCALLSIGN pattern
-        if " - " in pilot_name:
-            parts = pilot_name.split(" - ")
-            if len(parts) == 2:
-                left_part = parts[0].strip().lower()
-                right_part = parts[1].strip().lower()
-                
-                # Check if callsign appears in either part
-                if callsign_lower in left_part or callsign_lower in right_part:
-                    return True
+    if callsign_pattern.search(pilot_lower):
+        return True
+    
+    if any(pilot_lower in callsign_lower for callsign_lower in callsigns_lower):
+        return True
     
     # If we have squadron callsigns but pilot doesn't match any, it's likely AI
     return False
 
+@functools.lru_cache(maxsize=4096)
+def is_player_client_cached(pilot_name: str, aircraft_name: str, group: str,
+                            squadron_callsigns: tuple) -> bool:
+    """is_player_client memoized on its arguments; cleared at the start of each parse"""
+    return is_player_client(pilot_name, aircraft_name, group, squadron_callsigns)
+
+# (mtime, callsigns) from the last read of squadron_callsigns.json
+_SQUADRON_CALLSIGNS = None
+
 def load_squadron_callsigns() -> list:
-    """Load squadron callsigns from config file"""
+    """Load squadron callsigns from config file
+    
+    The file is only re-read when its mtime changes; callers get their own list.
+    """
+    global _SQUADRON_CALLSIGNS
     try:
-        config_path = os.path.join(os.path.dirname(__file__), 'config', 'squadron_callsigns.json')
-        if os.path.exists(config_path):
-            data = safe_json_read(config_path)
-            callsigns = data.get('callsigns', [])
-            return callsigns if isinstance(callsigns, list) else []
+        if os.path.exists(SQUADRON_CALLSIGNS_FILE):
+            mtime = os.stat(SQUADRON_CALLSIGNS_FILE).st_mtime_ns
+            if _SQUADRON_CALLSIGNS is None or _SQUADRON_CALLSIGNS[0] != mtime:
+                data = safe_json_read(SQUADRON_CALLSIGNS_FILE)
+                callsigns = data.get('callsigns', [])
+                _SQUADRON_CALLSIGNS = (mtime, tuple(callsigns) if isinstance(callsigns, list) else ())
+            return list(_SQUADRON_CALLSIGNS[1])
     except Exception as e:
         logger.warning(f"Warning: Could not load squadron callsigns: {e}")
     
@@ -853,26 +1084,39 @@ def load_squadron_callsigns_safe() -> list:
 
 def save_squadron_callsigns(callsigns: list):
     """Save squadron callsigns to config file"""
+    global _SQUADRON_CALLSIGNS
     try:
-        config_dir = os.path.join(os.path.dirname(__file__), 'config')
-        os.makedirs(config_dir, exist_ok=True)
-        
-        config_path = os.path.join(config_dir, 'squadron_callsigns.json')
-        safe_json_save(config_path, {'callsigns': callsigns})
+        os.makedirs(CONFIG_DIR, exist_ok=True)
+        safe_json_save(SQUADRON_CALLSIGNS_FILE, {'callsigns': callsigns})
+        # Drop the cached roster in case the rewrite kept the same mtime
+        _SQUADRON_CALLSIGNS = None
         
         return True
     except Exception as e:
         logger.error(f"Error saving squadron callsigns: {e}")
         return False
 
+# (mtime, missions) from the last read of processed_missions.json
+_PROCESSED_MISSIONS = None
+
+def load_processed_missions(processed_file: str) -> dict:
+    """Processed-missions dict, re-read only when the file's mtime changes
+    
+    The returned dict is shared; copy it before modifying.
+    """
+    global _PROCESSED_MISSIONS
+    if not os.path.exists(processed_file):
+        return {}
+    mtime = os.stat(processed_file).st_mtime_ns
+    if _PROCESSED_MISSIONS is None or _PROCESSED_MISSIONS[0] != mtime:
+        _PROCESSED_MISSIONS = (mtime, safe_json_read(processed_file))
+    return _PROCESSED_MISSIONS[1]
+
 def is_mission_already_processed(mission_name: str, mission_date: str) -> bool:
     """Check if a mission has already been processed"""
     try:
-        processed_file = os.path.join(os.path.dirname(__file__), 'config', 'processed_missions.json')
-        if os.path.exists(processed_file):
-            processed_missions = safe_json_read(processed_file)
-            mission_key = f"{mission_name}_{mission_date}"
-            return mission_key in processed_missions
+        mission_key = f"{mission_name}_{mission_date}"
+        return mission_key in load_processed_missions(PROCESSED_MISSIONS_FILE)
     except Exception as e:
         logger.warning(f"Warning: Could not check processed missions: {e}")
     
@@ -880,16 +1124,13 @@ def is_mission_already_processed(mission_name: str, mission_date: str) -> bool:
 
 def mark_mission_as_processed(mission_name: str, mission_date: str):
     """Mark a mission as processed to prevent duplicates"""
+    global _PROCESSED_MISSIONS
     try:
-        config_dir = os.path.join(os.path.dirname(__file__), 'config')
-        os.makedirs(config_dir, exist_ok=True)
-        
-        processed_file = os.path.join(config_dir, 'processed_missions.json')
+        os.makedirs(CONFIG_DIR, exist_ok=True)
+        processed_file = PROCESSED_MISSIONS_FILE
         
         # Load existing processed missions
-        processed_missions = {}
-        if os.path.exists(processed_file):
-            processed_missions = safe_json_read(processed_file)
+        processed_missions = dict(load_processed_missions(processed_file))
         
         # Add this mission
         mission_key = f"{mission_name}_{mission_date}"
@@ -900,14 +1141,19 @@ def mark_mission_as_processed(mission_name: str, mission_date: str):
         }
         
         # Keep only last 100 missions to prevent file from growing too large
-        if len(processed_missions) > 100:
-            # Remove oldest entries
-            sorted_missions = sorted(processed_missions.items(), 
-                                   key=lambda x: x[1].get('processed_at', ''))
-            processed_missions = dict(sorted_missions[-100:])
+        excess = len(processed_missions) - 100
+        if excess > 0:
+            # Remove oldest entries; usually just the one pushed out by this mission
+            oldest = nsmallest(excess, processed_missions.items(),
+                               key=lambda x: x[1].get('processed_at', ''))
+            for key, _ in oldest:
+                del processed_missions[key]
         
-        # Save back to file
+        # Save back to file (written to a temp file and swapped in)
         safe_json_save(processed_file, processed_missions)
+        
+        # Our own write is the current state, even if the mtime did not visibly change
+        _PROCESSED_MISSIONS = (os.stat(processed_file).st_mtime_ns, processed_missions)
             
     except Exception as e:
         logger.warning(f"Warning: Could not mark mission as processed: {e}")